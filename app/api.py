@@ -0,0 +1,42 @@
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import PlainTextResponse, RedirectResponse, Response
+from starlette.routing import Route
+from app.image_proxy import verify_image
+from app.metrics import REGISTRY
+from app.mlwbd import THUMBNAILS, async_get_thumbnail
+
+THUMBNAIL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+async def metrics_endpoint(request):
+    # The catalog collector counts rows in SQLite; keep rendering off the
+    # event loop.
+    body = await run_in_threadpool(REGISTRY.render)
+    return PlainTextResponse(
+        body, media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+async def image_endpoint(request):
+    url = request.query_params.get("u", "")
+    if not url.startswith(("http://", "https://")) or not verify_image(
+        url, request.query_params.get("s")
+    ):
+        return PlainTextResponse("Forbidden", status_code=403)
+    headers = {
+        "Cache-Control": THUMBNAIL_CACHE_CONTROL,
+        "ETag": f'"{THUMBNAILS.key(url)}"',
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    data = await async_get_thumbnail(url)
+    if data is None:
+        # Let the browser try the original poster rather than show nothing.
+        return RedirectResponse(url, status_code=302)
+    return Response(data, media_type="image/webp", headers=headers)
+
+
+api = Starlette(
+    routes=[Route("/metrics", metrics_endpoint), Route("/img", image_endpoint)]
+)
@@ -3,6 +3,8 @@ from app.states.search_state import SearchState
 from app.states.details_state import DetailsState, DownloadGroup, DownloadLink
 from app.states.auth_state import AuthState
 from app.components.movie_card import movie_card
+from app.api import api
+from app.mlwbd import run_catalog_crawler, run_endpoint_prober, run_parse_pool
 
 
 def navbar() -> rx.Component:
@@ -157,6 +159,30 @@ def latest_movies_section() -> rx.Component:
                     class_name="flex flex-col items-center justify-center py-20",
                 ),
                 rx.el.div(
+                    rx.cond(
+                        SearchState.has_previous_movies,
+                        rx.el.div(
+                            rx.el.button(
+                                rx.cond(
+                                    SearchState.is_loading_previous,
+                                    rx.spinner(color="white", size="2"),
+                                    "Load Previous Movies",
+                                ),
+                                on_click=SearchState.load_previous_movies,
+                                disabled=SearchState.is_loading_previous,
+                                class_name="bg-black text-white border border-white/20 px-6 py-3 rounded-sm font-bold text-sm disabled:opacity-50 disabled:cursor-not-allowed flex items-center justify-center gap-3 min-w-[160px] mx-auto hover:bg-white hover:text-black transition-colors",
+                            ),
+                            rx.el.p(
+                                "Pages "
+                                + SearchState.first_page.to_string()
+                                + "-"
+                                + SearchState.page.to_string(),
+                                class_name="text-white/60 text-xs font-medium mt-3",
+                            ),
+                            class_name="flex flex-col items-center pb-12",
+                        ),
+                        rx.fragment(),
+                    ),
                     rx.el.div(
                         rx.foreach(SearchState.latest_movies, movie_card),
                         class_name="grid grid-cols-2 sm:grid-cols-3 md:grid-cols-4 gap-6 md:gap-8",
@@ -258,9 +284,33 @@ def link_item(link: DownloadLink) -> rx.Component:
             class_name="flex items-center flex-grow min-w-0 mr-4",
         ),
         rx.el.div(
+            rx.cond(
+                link["status"] == "error",
+                rx.el.span(
+                    "Failed",
+                    class_name="text-[10px] uppercase tracking-wider font-bold text-white/60 mr-3",
+                ),
+                rx.fragment(),
+            ),
+            rx.cond(
+                link["direct"] != "",
+                rx.el.a(
+                    rx.el.button(
+                        rx.icon("download", class_name="w-3 h-3 mr-2"),
+                        "Download",
+                        class_name="px-3 py-1.5 bg-white text-black text-xs font-bold flex items-center uppercase tracking-wide rounded-sm border border-white hover:bg-gray-200 transition-colors",
+                    ),
+                    href=link["direct"],
+                    target="_blank",
+                    rel="noreferrer noopener",
+                    class_name="mr-2",
+                ),
+                rx.fragment(),
+            ),
             rx.cond(
                 (DetailsState.selected_link_url == link["url"])
-                & (DetailsState.direct_link != ""),
+                & (DetailsState.direct_link != "")
+                & (link["direct"] == ""),
                 rx.el.a(
                     rx.el.button(
                         rx.icon("download", class_name="w-3 h-3 mr-2"),
@@ -276,8 +326,11 @@ def link_item(link: DownloadLink) -> rx.Component:
             ),
             rx.el.button(
                 rx.cond(
-                    (DetailsState.selected_link_url == link["url"])
-                    & DetailsState.is_generating_direct,
+                    (
+                        (DetailsState.selected_link_url == link["url"])
+                        & DetailsState.is_generating_direct
+                    )
+                    | (link["status"] == "pending"),
                     rx.spinner(size="1", color="white"),
                     rx.el.span("Get Link"),
                 ),
@@ -335,6 +388,38 @@ def generated_link_section() -> rx.Component:
     )
 
 
+def resolve_all_bar() -> rx.Component:
+    return rx.cond(
+        DetailsState.download_groups.length() > 0,
+        rx.el.div(
+            rx.el.p(
+                rx.cond(
+                    DetailsState.is_resolving_all,
+                    "Resolving "
+                    + DetailsState.resolved_count.to_string()
+                    + " / "
+                    + DetailsState.resolve_total.to_string(),
+                    "Generate direct links for every option at once.",
+                ),
+                class_name="text-white text-xs font-medium",
+            ),
+            rx.el.button(
+                rx.cond(
+                    DetailsState.is_resolving_all,
+                    rx.spinner(size="1", color="white"),
+                    rx.icon("zap", class_name="w-3 h-3 mr-2"),
+                ),
+                "Resolve All",
+                on_click=DetailsState.resolve_all_links,
+                disabled=DetailsState.is_resolving_all | DetailsState.is_fetching_links,
+                class_name="px-3 py-1.5 border border-white/20 hover:bg-white hover:text-black text-white text-xs font-bold disabled:opacity-50 uppercase tracking-wide rounded-sm bg-black transition-colors flex items-center gap-2",
+            ),
+            class_name="flex items-center justify-between p-3 mb-4 border border-white/10 rounded-sm bg-black",
+        ),
+        rx.fragment(),
+    )
+
+
 def details() -> rx.Component:
     return rx.el.div(
         navbar(),
@@ -354,6 +439,7 @@ def details() -> rx.Component:
                     class_name="text-3xl md:text-5xl font-bold text-white mb-10 tracking-tight",
                 ),
                 generated_link_section(),
+                resolve_all_bar(),
                 rx.cond(
                     DetailsState.is_fetching_links,
                     rx.el.div(
@@ -380,6 +466,7 @@ def details() -> rx.Component:
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
+    api_transformer=api,
     head_components=[
         rx.el.meta(
             name="description",
@@ -398,4 +485,7 @@ app.add_page(index, route="/", on_load=[AuthState.on_load, SearchState.on_load])
 app.add_page(
     details, route="/details", on_load=[AuthState.on_load, DetailsState.on_load]
 )
-app.add_page(login_page, route="/login", on_load=AuthState.on_load)
\ No newline at end of file
+app.add_page(login_page, route="/login", on_load=AuthState.on_load)
+app.register_lifespan_task(run_catalog_crawler)
+app.register_lifespan_task(run_endpoint_prober)
+app.register_lifespan_task(run_parse_pool)
\ No newline at end of file
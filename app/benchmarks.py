@@ -0,0 +1,212 @@
+import asyncio
+import tempfile
+import time
+from bs4 import BeautifulSoup
+from app import mlwbd
+from app.clearance import ClearanceStore
+from app.fake_upstream import FakeUpstream
+from app.fixtures import (
+    load_fixture,
+    synthetic_dld_page,
+    synthetic_download_page,
+    synthetic_titles,
+)
+from app.js_scan import legacy_array_item, string_array_item
+from app.link_cache import LinkCache
+from app.link_parser import legacy_sections, segment_sections
+from app.listing_parser import (
+    parse_listing_full,
+    parse_listing_lxml,
+    parse_listing_soup,
+)
+from app.models import MovieSummary
+from app.parse_pool import ParsePool, link_rows
+from app.scheduler import BACKGROUND, INTERACTIVE, RequestScheduler
+from app.trigram import TrigramIndex
+
+
+def timeit(fn, *args, repeat=50):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_listing_parser(repeat=50):
+    print("Listing parser throughput (pages/sec):")
+    for name in ["latest_page.html", "search_page.html"]:
+        html = load_fixture(name)
+        for label, parser in [
+            ("html.parser full", parse_listing_full),
+            ("html.parser strainer", parse_listing_soup),
+            ("lxml", parse_listing_lxml),
+        ]:
+            elapsed = timeit(parser, html, repeat=repeat)
+            print(f"  {name:<20} {label:<22} {1 / elapsed:10.1f}")
+
+
+def bench_section_segmenter(sizes=(50, 100, 200, 400), repeat=3):
+    print("Download page sections, ms per page (legacy scan vs single pass):")
+    for inline in [False, True]:
+        layout = "inline links" if inline else "ul blocks"
+        for episodes in sizes:
+            html = synthetic_download_page(episodes, inline=inline)
+            soup = BeautifulSoup(html, "html.parser")
+            legacy = timeit(legacy_sections, soup, repeat=repeat) * 1000
+            single = timeit(segment_sections, soup, repeat=repeat) * 1000
+            print(
+                f"  {layout:<12} {episodes:>4} episodes  legacy {legacy:9.1f}"
+                f"  single pass {single:7.1f}  x{legacy / single:.1f}"
+            )
+
+
+def bench_offline_chain(latency=0.02, movies=8):
+    print(
+        f"Offline link chain against the stand-in upstream ({latency * 1000:.0f} ms/hop):"
+    )
+    with (
+        FakeUpstream(latency=latency) as upstream,
+        tempfile.TemporaryDirectory() as tmp,
+    ):
+        upstream.configure(mlwbd.ENDPOINTS)
+        mlwbd.LINK_CACHE = LinkCache(f"{tmp}/links.db")
+        mlwbd.CLEARANCE = ClearanceStore(f"{tmp}/clearance.db")
+        mlwbd.SCHEDULER = RequestScheduler()
+        urls = [f"{upstream.base_url}/fojik/bench-movie-{i}/" for i in range(movies)]
+
+        async def resolve_all():
+            return await asyncio.gather(
+                *[mlwbd.async_get_download_links(url) for url in urls]
+            )
+
+        for label in ["cold", "warm"]:
+            start = time.perf_counter()
+            mlwbd.run_sync(resolve_all())
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<5} {movies} movies in {elapsed * 1000:8.1f} ms")
+        start = time.perf_counter()
+        groups = mlwbd.get_download_links(urls[0])
+        direct = mlwbd.get_main_link_(groups[0].links[0].url)
+        elapsed = time.perf_counter() - start
+        print(f"  direct link {direct.rsplit('/', 1)[-1]} in {elapsed * 1000:8.1f} ms")
+
+
+def bench_trigram_index(sizes=(10000, 40000), repeat=200):
+    print("Fuzzy title lookups, ms per query:")
+    queries = ["avatr way of watr", "famly man sesn 2", "hindi 1080p", "xyz"]
+    for size in sizes:
+        index = TrigramIndex(max_entries=size + 2)
+        movies = synthetic_titles(size)
+        movies.append(MovieSummary("Avatar.The.Way.Of.Water.2022.1080p", "", "/a"))
+        movies.append(MovieSummary("The.Family.Man.Season.2.Hindi.720p", "", "/f"))
+        start = time.perf_counter()
+        index.add(movies)
+        build = (time.perf_counter() - start) * 1000
+        timings = "  ".join(
+            f"{query!r} {timeit(index.search, query, repeat=repeat) * 1000:.3f}"
+            for query in queries
+        )
+        print(f"  {size:>6} titles  build {build:7.1f} ms  {timings}")
+
+
+def bench_js_array_scan(sizes=(25, 500, 5000), repeat=200):
+    print("dld.php token extraction, us per page (literal_eval vs scanner):")
+    for elements in sizes:
+        html = synthetic_dld_page(elements)
+        assert legacy_array_item(html, 18) == string_array_item(html, 18, "_0x12fb2a")
+        legacy = timeit(legacy_array_item, html, 18, repeat=repeat) * 1e6
+        scanner = timeit(string_array_item, html, 18, "_0x12fb2a", repeat=repeat) * 1e6
+        print(
+            f"  {elements:>5} elements  literal_eval {legacy:9.1f}"
+            f"  scanner {scanner:7.1f}  x{legacy / scanner:.1f}"
+        )
+
+
+def bench_parse_pool(pages=40, workers=2):
+    html = load_fixture("download_page.html").encode()
+    print(f"{pages} final-page parses next to a 1 ms heartbeat on the same loop:")
+    for label, pool in [
+        ("on loop", None),
+        ("thread", ParsePool(0)),
+        (f"{workers} procs", ParsePool(workers)),
+    ]:
+
+        async def scenario():
+            stalls = []
+            done = asyncio.Event()
+
+            async def heartbeat():
+                while not done.is_set():
+                    start = time.perf_counter()
+                    await asyncio.sleep(0.001)
+                    stalls.append(time.perf_counter() - start - 0.001)
+
+            beat = asyncio.ensure_future(heartbeat())
+            await asyncio.sleep(0)
+            start = time.perf_counter()
+            if pool is None:
+                for _ in range(pages):
+                    link_rows(html)
+            else:
+                await asyncio.gather(
+                    *[pool.run(link_rows, html, "utf-8") for _ in range(pages)]
+                )
+            elapsed = time.perf_counter() - start
+            done.set()
+            await beat
+            return elapsed, max(stalls, default=0)
+
+        if pool is not None:
+            pool.start()
+            asyncio.run(pool.run(link_rows, html, "utf-8"))
+        elapsed, stall = asyncio.run(scenario())
+        if pool is not None:
+            pool.shutdown()
+        print(
+            f"  {label:<8} total {elapsed * 1000:7.1f} ms"
+            f"  worst loop stall {stall * 1000:6.1f} ms"
+        )
+
+
+def bench_scheduler(background=40, interactive=5, rate=100, service=0.005):
+    print(
+        f"{interactive} interactive requests behind {background} background ones"
+        f" on one host ({rate} rps, {service * 1000:.0f} ms each):"
+    )
+    for label, classes in [
+        ("fifo", (INTERACTIVE, INTERACTIVE)),
+        ("priority", (BACKGROUND, INTERACTIVE)),
+    ]:
+        scheduler = RequestScheduler(rate=rate, concurrency=4)
+
+        async def request(priority, waits):
+            async with scheduler.slot("upstream", priority) as waited:
+                waits.append(waited)
+                await asyncio.sleep(service)
+
+        async def scenario():
+            waits = []
+            batch = [request(classes[0], []) for _ in range(background)]
+            tasks = [asyncio.ensure_future(coro) for coro in batch]
+            await asyncio.sleep(0.02)
+            await asyncio.gather(
+                *[request(classes[1], waits) for _ in range(interactive)]
+            )
+            await asyncio.gather(*tasks)
+            return waits
+
+        waits = asyncio.run(scenario())
+        print(
+            f"  {label:<8} interactive wait mean {sum(waits) / len(waits) * 1000:6.1f} ms"
+            f"  max {max(waits) * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    bench_listing_parser()
+    bench_section_segmenter()
+    bench_offline_chain()
+    bench_trigram_index()
+    bench_js_array_scan()
+    bench_parse_pool()
+    bench_scheduler()
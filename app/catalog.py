@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from app.models import MovieSummary
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(text):
+    # Every word must match as a prefix; quoting keeps FTS5 operators in user
+    # input ("AND", "-", "*") from being interpreted.
+    tokens = _TOKEN.findall(text.lower())
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class Catalog:
+    def __init__(self, path, stale_ttl=3600):
+        self.path = path
+        self.stale_ttl = stale_ttl
+        self._local = threading.local()
+        self.available = True
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            try:
+                conn.executescript(
+                    "CREATE TABLE IF NOT EXISTS movies ("
+                    "id INTEGER PRIMARY KEY, link TEXT NOT NULL UNIQUE, "
+                    "title TEXT NOT NULL, image TEXT NOT NULL, "
+                    "first_seen REAL NOT NULL, last_seen REAL NOT NULL);"
+                    "CREATE TABLE IF NOT EXISTS crawl_state ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5("
+                    "title, content='movies', content_rowid='id', "
+                    "tokenize='unicode61 remove_diacritics 2');"
+                    "CREATE TRIGGER IF NOT EXISTS movies_ai AFTER INSERT ON movies BEGIN "
+                    "INSERT INTO movies_fts(rowid, title) VALUES (new.id, new.title); END;"
+                    "CREATE TRIGGER IF NOT EXISTS movies_au AFTER UPDATE OF title ON movies BEGIN "
+                    "INSERT INTO movies_fts(movies_fts, rowid, title) "
+                    "VALUES ('delete', old.id, old.title); "
+                    "INSERT INTO movies_fts(rowid, title) VALUES (new.id, new.title); END;"
+                )
+            except sqlite3.OperationalError as e:
+                conn.close()
+                if "fts5" in str(e):
+                    # SQLite builds without FTS5 keep working; search goes live.
+                    logging.warning(f"Catalog disabled: {e}")
+                    self.available = False
+                raise
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, movies):
+        if not self.available or not movies:
+            return 0
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                added = conn.executemany(
+                    "INSERT OR IGNORE INTO movies "
+                    "(link, title, image, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (movie.link, movie.title, movie.image, now, now)
+                        for movie in movies
+                    ],
+                ).rowcount
+                conn.executemany(
+                    "UPDATE movies SET title = ?, image = ? "
+                    "WHERE link = ? AND (title != ? OR image != ?)",
+                    [
+                        (movie.title, movie.image, movie.link, movie.title, movie.image)
+                        for movie in movies
+                    ],
+                )
+                conn.executemany(
+                    "UPDATE movies SET last_seen = ? WHERE link = ?",
+                    [(now, movie.link) for movie in movies],
+                )
+            return added
+        except sqlite3.Error as e:
+            logging.warning(f"Catalog upsert failed: {e}")
+            return 0
+
+    def search(self, text, limit=40):
+        query = fts_query(text)
+        if not self.available or not query:
+            return []
+        try:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT m.title, m.image, m.link FROM movies_fts "
+                    "JOIN movies m ON m.id = movies_fts.rowid "
+                    "WHERE movies_fts MATCH ? "
+                    "ORDER BY bm25(movies_fts), m.last_seen DESC LIMIT ?",
+                    (query, limit),
+                )
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Catalog search failed for {text!r}: {e}")
+            return []
+        if not rows:
+            self.misses += 1
+            return []
+        self.hits += 1
+        return [MovieSummary(title, image, link) for title, image, link in rows]
+
+    def get_state(self, key, default=None):
+        try:
+            row = (
+                self._connect()
+                .execute("SELECT value FROM crawl_state WHERE key = ?", (key,))
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Catalog state read failed for {key}: {e}")
+            return default
+        return row[0] if row else default
+
+    def set_state(self, key, value):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO crawl_state VALUES (?, ?)",
+                    (key, str(value)),
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Catalog state write failed for {key}: {e}")
+
+    def is_fresh(self):
+        if not self.available or self.get_state("backfill_done") != "1":
+            return False
+        refreshed_at = float(self.get_state("refreshed_at", 0))
+        return time.time() - refreshed_at < self.stale_ttl
+
+    def count(self):
+        try:
+            return self._connect().execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": self.count()}
+
+
+class PageUnavailable(Exception):
+    pass
+
+
+class CatalogCrawler:
+    def __init__(
+        self,
+        catalog,
+        fetch_page,
+        page_interval=2.0,
+        cycle_interval=600,
+        pages_per_cycle=20,
+        max_pages=500,
+    ):
+        self.catalog = catalog
+        self._fetch_page = fetch_page
+        self.page_interval = page_interval
+        self.cycle_interval = cycle_interval
+        self.pages_per_cycle = pages_per_cycle
+        self.max_pages = max_pages
+        self.pages_fetched = 0
+        self.movies_added = 0
+        self.cycles = 0
+
+    async def run_forever(self):
+        logging.info("Catalog crawler started")
+        while True:
+            try:
+                await self.crawl_cycle()
+            except Exception as e:
+                logging.exception(f"Catalog crawl cycle failed: {e}")
+            await asyncio.sleep(self.cycle_interval)
+
+    async def _crawl_page(self, page):
+        if self.pages_fetched and self.page_interval:
+            await asyncio.sleep(self.page_interval)
+        movies = await self._fetch_page(page)
+        self.pages_fetched += 1
+        added = await asyncio.to_thread(self.catalog.upsert, movies)
+        self.movies_added += added
+        return movies, added
+
+    async def crawl_cycle(self):
+        # Listings are newest first. The head pass walks from page 1 until it
+        # reaches a movie the previous head pass saw on page 1; the backfill
+        # pass then resumes the deep crawl from the persisted watermark until
+        # the end of the listing. fetch_page returns [] only past the end and
+        # raises PageUnavailable when a page could not be fetched, which ends
+        # the cycle with the watermark left on that page.
+        budget = self.pages_per_cycle
+        catalog = self.catalog
+        backfill_page = int(catalog.get_state("backfill_page", 1))
+        try:
+            # Search results are written to the catalog as well, so "nothing
+            # new on this page" would not prove the head pass had caught up.
+            marks = set(filter(None, catalog.get_state("head_marks", "").split("\n")))
+            head = None
+            page = 1
+            while budget > 0 and page <= self.max_pages:
+                movies, _ = await self._crawl_page(page)
+                budget -= 1
+                if not movies:
+                    break
+                links = [movie.link for movie in movies]
+                head = head or links
+                page += 1
+                if page > backfill_page:
+                    backfill_page = page
+                    catalog.set_state("backfill_page", backfill_page)
+                if not marks or marks.intersection(links):
+                    catalog.set_state("head_marks", "\n".join(head))
+                    catalog.set_state("refreshed_at", time.time())
+                    break
+            while budget > 0 and catalog.get_state("backfill_done") != "1":
+                if backfill_page > self.max_pages:
+                    catalog.set_state("backfill_done", 1)
+                    break
+                movies, _ = await self._crawl_page(backfill_page)
+                budget -= 1
+                if not movies:
+                    catalog.set_state("backfill_done", 1)
+                    break
+                backfill_page += 1
+                catalog.set_state("backfill_page", backfill_page)
+        except PageUnavailable as e:
+            logging.warning(f"Catalog crawl stopped early, retrying next cycle: {e}")
+        self.cycles += 1
+        logging.info(
+            f"Catalog crawl cycle done: {catalog.count()} movies, "
+            f"backfill at page {backfill_page}"
+        )
+
+    def stats(self):
+        return {
+            "cycles": self.cycles,
+            "pages_fetched": self.pages_fetched,
+            "movies_added": self.movies_added,
+        }
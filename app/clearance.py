@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+
+def _is_clearance_cookie(name):
+    return name.startswith(("cf_", "__cf"))
+
+
+def session_clearance(session, hostname):
+    # Cloudflare cookies the session holds for `hostname`, as plain rows.
+    return [
+        [cookie.name, cookie.value, cookie.domain, cookie.path, cookie.expires]
+        for cookie in session.cookies
+        if _is_clearance_cookie(cookie.name)
+        and hostname.endswith(cookie.domain.lstrip("."))
+    ]
+
+
+def apply_clearance(session, rows):
+    for name, value, domain, path, expires in rows:
+        session.cookies.set(name, value, domain=domain, path=path, expires=expires)
+
+
+class ClearanceStore:
+    def __init__(self, path, ttl=1800, lease_ttl=30, margin=60):
+        self.path = path
+        self.ttl = ttl
+        self.lease_ttl = lease_ttl
+        self.margin = margin
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.waits = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS clearances ("
+                "host TEXT NOT NULL, user_agent TEXT NOT NULL, cookies TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (host, user_agent));"
+                "CREATE TABLE IF NOT EXISTS clearance_leases ("
+                "host TEXT NOT NULL, user_agent TEXT NOT NULL, owner TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (host, user_agent));"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, host, user_agent):
+        # None means no usable entry; an empty list means the host answered
+        # without a challenge and there is nothing to solve.
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT cookies FROM clearances "
+                    "WHERE host = ? AND user_agent = ? AND expires_at > ?",
+                    (host, user_agent, time.time()),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Clearance read failed for {host}: {e}")
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, host, user_agent, rows):
+        now = time.time()
+        expiries = [row[4] for row in rows if row[4]]
+        expires_at = min(expiries, default=now + self.ttl) - self.margin
+        if expires_at <= now:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO clearances VALUES (?, ?, ?, ?)",
+                    (host, user_agent, json.dumps(rows), expires_at),
+                )
+            self.stored += 1
+        except sqlite3.Error as e:
+            logging.warning(f"Clearance write failed for {host}: {e}")
+
+    def acquire(self, host, user_agent):
+        # A single upsert claims the refresh lease unless another worker holds
+        # an unexpired one, so exactly one process solves each challenge.
+        owner = secrets.token_hex(8)
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                claimed = conn.execute(
+                    "INSERT INTO clearance_leases VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (host, user_agent) DO UPDATE SET "
+                    "owner = excluded.owner, expires_at = excluded.expires_at "
+                    "WHERE clearance_leases.expires_at <= ?",
+                    (host, user_agent, owner, now + self.lease_ttl, now),
+                ).rowcount
+        except sqlite3.Error as e:
+            logging.warning(f"Clearance lease failed for {host}: {e}")
+            return owner
+        if not claimed:
+            self.waits += 1
+            return None
+        return owner
+
+    def release(self, host, user_agent, owner):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "DELETE FROM clearance_leases "
+                    "WHERE host = ? AND user_agent = ? AND owner = ?",
+                    (host, user_agent, owner),
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Clearance lease release failed for {host}: {e}")
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stored": self.stored,
+            "waits": self.waits,
+        }
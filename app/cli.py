@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from app import mlwbd, scraper_config
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def parse_rates(specs, registry):
+    # "fojik=2" limits every mirror of a role; "host[:port]=rps" a single host.
+    rates = {}
+    roles = {}
+    for mirror in registry.mirrors():
+        roles.setdefault(mirror.role, []).append(mirror.key.split("/", 1)[0])
+    for spec in specs:
+        name, _, value = spec.partition("=")
+        try:
+            rps = float(value)
+        except ValueError:
+            raise ValueError(f"Expected HOST=RPS, got {spec!r}") from None
+        for host in roles.get(name, [name]):
+            rates[host] = rps
+    return rates
+
+
+def read_inputs(path):
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    with handle:
+        lines = [line.strip() for line in handle]
+    return list(dict.fromkeys(line for line in lines if line and line[0] != "#"))
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+class BatchRun:
+    def __init__(self, out, checkpoint=None, concurrency=4, link_concurrency=4):
+        self.out = out
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.link_concurrency = link_concurrency
+        self.movie_seconds = []
+        self.link_seconds = []
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.links = 0
+        self.direct = 0
+
+    async def run(self, inputs):
+        completed = load_checkpoint(self.checkpoint)
+        pending = [item for item in inputs if item not in completed]
+        self.skipped = len(inputs) - len(pending)
+        movie_slots = asyncio.Semaphore(self.concurrency)
+        link_slots = asyncio.Semaphore(self.link_concurrency)
+        checkpoint = (
+            open(self.checkpoint, "a", encoding="utf-8") if self.checkpoint else None
+        )
+
+        async def process(item):
+            async with movie_slots:
+                return await self._resolve(item, link_slots)
+
+        started = time.perf_counter()
+        try:
+            for next_done in asyncio.as_completed([process(item) for item in pending]):
+                record = await next_done
+                self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self.out.flush()
+                if record["ok"]:
+                    self.done += 1
+                    if checkpoint:
+                        checkpoint.write(record["input"] + "\n")
+                        checkpoint.flush()
+                else:
+                    self.failed += 1
+        finally:
+            if checkpoint:
+                checkpoint.close()
+        return time.perf_counter() - started
+
+    async def _resolve(self, item, link_slots):
+        started = time.perf_counter()
+        record = {"input": item, "url": item, "ok": False}
+        try:
+            if not item.startswith(("http://", "https://")):
+                movies = await mlwbd.async_search_movie(item)
+                if not movies:
+                    record["error"] = "no search results"
+                    return record
+                record["title"] = movies[0].title
+                record["url"] = movies[0].link
+            groups = await mlwbd.async_get_download_links(record["url"])
+            if not groups:
+                record["error"] = "no download links"
+                return record
+
+            async def direct(link):
+                async with link_slots:
+                    link_started = time.perf_counter()
+                    result = await mlwbd.async_get_main_link(link.url)
+                    self.link_seconds.append(time.perf_counter() - link_started)
+                return result
+
+            links = [link for group in groups for link in group.links]
+            results = await asyncio.gather(*[direct(link) for link in links])
+            resolved = iter(results)
+            record["groups"] = [
+                {
+                    "title": group.title,
+                    "links": [
+                        _link_record(link, next(resolved)) for link in group.links
+                    ],
+                }
+                for group in groups
+            ]
+            direct_count = sum(1 for result in results if _is_direct(result))
+            self.links += len(links)
+            self.direct += direct_count
+            # Only fully resolved movies are checkpointed; anything short of
+            # that is retried on the next run.
+            if direct_count < len(links):
+                unresolved = len(links) - direct_count
+                record["error"] = f"{unresolved} of {len(links)} links unresolved"
+                return record
+            record["ok"] = True
+        except Exception as e:
+            logging.exception(f"Batch item {item!r} failed: {e}")
+            record["error"] = str(e)
+        finally:
+            elapsed = time.perf_counter() - started
+            record["seconds"] = round(elapsed, 3)
+            self.movie_seconds.append(elapsed)
+        return record
+
+    def summary(self, elapsed):
+        rate = self.done / elapsed if elapsed else 0.0
+        link_rate = self.links / elapsed if elapsed else 0.0
+        return (
+            f"{self.done} done, {self.failed} failed, {self.skipped} skipped "
+            f"in {elapsed:.1f}s ({rate:.2f} movies/s, {link_rate:.2f} links/s)\n"
+            f"direct links: {self.direct}/{self.links}\n"
+            f"movie latency p50 {_percentile(self.movie_seconds, 0.5):.2f}s "
+            f"p95 {_percentile(self.movie_seconds, 0.95):.2f}s "
+            f"max {max(self.movie_seconds, default=0):.2f}s\n"
+            f"link latency p50 {_percentile(self.link_seconds, 0.5):.2f}s "
+            f"p95 {_percentile(self.link_seconds, 0.95):.2f}s "
+            f"max {max(self.link_seconds, default=0):.2f}s"
+        )
+
+
+def _is_direct(result):
+    return isinstance(result, str) and result.startswith("http")
+
+
+def _link_record(link, result):
+    entry = {"label": link.label, "url": link.url, "info": link.info}
+    if _is_direct(result):
+        entry["direct"] = result
+    else:
+        entry["error"] = result
+    return entry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Resolve movie URLs or search terms to direct download links."
+    )
+    parser.add_argument(
+        "input", help="file with one movie URL or search term per line, or -"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="JSONL output file (default stdout)"
+    )
+    parser.add_argument("--checkpoint", help="file of finished inputs; rerun to resume")
+    parser.add_argument("--concurrency", type=int, default=4, help="movies in flight")
+    parser.add_argument(
+        "--link-concurrency",
+        type=int,
+        default=scraper_config.RESOLVE_CONCURRENCY,
+        help="direct-link resolutions in flight across all movies",
+    )
+    parser.add_argument(
+        "--rate",
+        action="append",
+        default=[],
+        metavar="HOST=RPS",
+        help="requests per second for a host or role (fojik, sharelink, ...)",
+    )
+    parser.add_argument(
+        "--default-rate",
+        type=float,
+        default=scraper_config.HOST_RATE,
+        help="requests per second for other hosts (0 for unlimited)",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=scraper_config.HOST_BURST,
+        help="requests a host may receive back to back before the rate applies",
+    )
+    parser.add_argument(
+        "--host-concurrency",
+        type=int,
+        default=scraper_config.HOST_CONCURRENCY,
+        help="requests in flight per host (0 for unlimited)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    try:
+        rates = parse_rates(args.rate, mlwbd.ENDPOINTS)
+    except ValueError as e:
+        parser.error(str(e))
+    mlwbd.SCHEDULER.configure(
+        rates, args.default_rate, args.burst, args.host_concurrency
+    )
+    mlwbd.PARSE_POOL.start()
+    inputs = read_inputs(args.input)
+    out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    batch = BatchRun(out, args.checkpoint, args.concurrency, args.link_concurrency)
+    try:
+        elapsed = asyncio.run(batch.run(inputs))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(batch.summary(elapsed), file=sys.stderr)
+    return 1 if batch.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,7 @@ def movie_card(movie: dict[str, str]) -> rx.Component:
         rx.el.div(
             rx.el.div(
                 rx.image(
-                    src=movie["image"],
+                    src=movie["thumb"],
                     alt=movie["title"],
                     class_name="w-full h-full object-cover",
                     loading="lazy",
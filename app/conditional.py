@@ -0,0 +1,67 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ConditionalCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.not_modified = 0
+        self.unchanged = 0
+        self.parsed = 0
+
+    def headers(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        etag, last_modified, _, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    async def resolve(self, key, response, parse):
+        # A 304 or a byte-identical body reuses the stored parse; anything
+        # else is parsed and remembered along with its validators.
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if response.status_code == 304 and entry is not None:
+            self.not_modified += 1
+            return entry[3]
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if entry is not None and entry[2] == digest:
+            self.unchanged += 1
+            result = entry[3]
+        else:
+            self.parsed += 1
+            result = await parse(response)
+        if result:
+            self._store(key, response.headers, digest, result)
+        return result
+
+    def _store(self, key, headers, digest, result):
+        entry = (headers.get("ETag"), headers.get("Last-Modified"), digest, result)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "parsed": self.parsed,
+            "size": len(self._entries),
+        }
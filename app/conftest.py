@@ -0,0 +1,39 @@
+import pytest
+from app import mlwbd
+from app.catalog import Catalog
+from app.clearance import ClearanceStore
+from app.conditional import ConditionalCache
+from app.endpoints import EndpointRegistry
+from app.fake_upstream import FakeUpstream
+from app.image_proxy import ThumbnailCache
+from app.link_cache import LinkCache
+from app.retry import RetryPolicy
+from app.scheduler import RequestScheduler
+from app.trigram import TrigramIndex
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    server = FakeUpstream(seed=1).start()
+    mirrors = {role: [url] for role, url in server.urls().items()}
+    monkeypatch.setattr(mlwbd, "ENDPOINTS", EndpointRegistry(mirrors))
+    monkeypatch.setattr(mlwbd, "LINK_CACHE", LinkCache(str(tmp_path / "links.db")))
+    monkeypatch.setattr(
+        mlwbd, "CLEARANCE", ClearanceStore(str(tmp_path / "clearance.db"))
+    )
+    monkeypatch.setattr(mlwbd, "CATALOG", Catalog(str(tmp_path / "catalog.db")))
+    monkeypatch.setattr(mlwbd, "TITLE_INDEX", TrigramIndex())
+    # Every stand-in mirror is one local host; don't throttle it.
+    monkeypatch.setattr(mlwbd, "SCHEDULER", RequestScheduler())
+    monkeypatch.setattr(mlwbd, "CONDITIONAL", ConditionalCache())
+    monkeypatch.setattr(mlwbd, "THUMBNAILS", ThumbnailCache(str(tmp_path / "thumbs")))
+    monkeypatch.setattr(
+        mlwbd,
+        "RETRY_POLICY",
+        RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.05),
+    )
+    mlwbd.SEARCH_CACHE.clear()
+    mlwbd.LATEST_CACHE.clear()
+    mlwbd.CIRCUIT_BREAKERS.reset()
+    yield server
+    server.stop()
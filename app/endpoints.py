@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import threading
+import time
+
+
+def _strip_scheme(url):
+    # Mirrors are matched without their scheme so http/https variants of a
+    # stored link still resolve to the same mirror.
+    return url.split("://", 1)[-1]
+
+
+def _site(url):
+    # Stored links may or may not carry "www." whichever way the mirror is
+    # configured; both belong to it.
+    return _strip_scheme(url).removeprefix("www.")
+
+
+class Mirror:
+    def __init__(self, role, url, rank):
+        self.role = role
+        self.url = url.rstrip("/")
+        self.key = _strip_scheme(self.url)
+        self.site = _site(self.url)
+        self.rank = rank
+        self.latency = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.failed_at = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def score(self):
+        return self.latency * (1 + 2 * self.error_rate)
+
+
+def _longest_match(url, entries):
+    rest = _site(url)
+    best = None
+    for entry in entries:
+        prefixes = (f"{entry.site}/", f"{entry.site}?")
+        if rest != entry.site and not rest.startswith(prefixes):
+            continue
+        if best is None or len(entry.site) > len(best.site):
+            best = entry
+    return best
+
+
+class Alias:
+    # A domain a role used to live on: its links are still recognised and
+    # rewritten onto the current mirrors, but it is never requested itself.
+    def __init__(self, role, url):
+        self.role = role
+        self.site = _site(url.rstrip("/"))
+
+
+class EndpointRegistry:
+    def __init__(
+        self,
+        mirrors,
+        aliases=None,
+        failure_threshold=3,
+        recovery_time=300,
+        alpha=0.3,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self.configure(mirrors, aliases)
+
+    def configure(self, mirrors, aliases=None):
+        with self._lock:
+            self._aliases = [
+                Alias(role, url)
+                for role, urls in (aliases or {}).items()
+                for url in urls
+            ]
+            # "a|b" gives two mirrors the same preference.
+            self._roles = {
+                role: [
+                    Mirror(role, url, rank)
+                    for rank, entry in enumerate(urls)
+                    for url in entry.split("|")
+                ]
+                for role, urls in mirrors.items()
+            }
+
+    def mirrors(self):
+        return [mirror for mirrors in self._roles.values() for mirror in mirrors]
+
+    def healthy(self, mirror, now=None):
+        if mirror.failures < self.failure_threshold:
+            return True
+        # Past the recovery time a down mirror gets traffic again; one more
+        # failure puts it straight back behind the others.
+        return (now or time.monotonic()) - mirror.failed_at >= self.recovery_time
+
+    def candidates(self, role):
+        now = time.monotonic()
+        with self._lock:
+            mirrors = list(self._roles[role])
+        # Healthy mirrors first, in configured order: a fast answer is no
+        # proof of a working mirror (a parked domain answers quickly too), so
+        # latency only orders mirrors configured with the same preference.
+        return sorted(
+            mirrors,
+            key=lambda m: (
+                not self.healthy(m, now),
+                m.rank,
+                m.latency is None,
+                m.score() if m.latency is not None else 0,
+            ),
+        )
+
+    def url(self, role):
+        return self.candidates(role)[0].url
+
+    def mirror_for(self, url):
+        return _longest_match(url, self.mirrors())
+
+    def _owner(self, url):
+        return self.mirror_for(url) or _longest_match(url, self._aliases)
+
+    def owns(self, url, role):
+        owner = self._owner(url)
+        return owner is not None and owner.role == role
+
+    def failover(self, url):
+        # The same path on every mirror of the url's role, best first. Urls
+        # outside the registry are returned unchanged.
+        owner = self._owner(url)
+        if owner is None:
+            return [url]
+        suffix = _site(url)[len(owner.site) :]
+        return [candidate.url + suffix for candidate in self.candidates(owner.role)]
+
+    def record(self, url, ok, elapsed=None):
+        mirror = self.mirror_for(url)
+        if mirror is None:
+            return
+        with self._lock:
+            mirror.requests += 1
+            mirror.error_rate += self.alpha * ((0.0 if ok else 1.0) - mirror.error_rate)
+            if not ok:
+                mirror.errors += 1
+                mirror.failures += 1
+                if mirror.failures >= self.failure_threshold:
+                    if mirror.failures == self.failure_threshold:
+                        logging.warning(f"Mirror {mirror.url} marked unhealthy")
+                    mirror.failed_at = time.monotonic()
+                return
+            if mirror.failures >= self.failure_threshold:
+                logging.info(f"Mirror {mirror.url} is healthy again")
+            mirror.failures = 0
+            if elapsed is not None:
+                if mirror.latency is None:
+                    mirror.latency = elapsed
+                else:
+                    mirror.latency += self.alpha * (elapsed - mirror.latency)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                (mirror.role, mirror.url): {
+                    "healthy": int(self.healthy(mirror, now)),
+                    "latency_seconds": mirror.latency or 0.0,
+                    "error_rate": mirror.error_rate,
+                    "requests": mirror.requests,
+                    "errors": mirror.errors,
+                }
+                for mirror in self.mirrors()
+            }
+
+
+class EndpointProber:
+    def __init__(self, registry, probe, interval=120):
+        self.registry = registry
+        self._probe = probe
+        self.interval = interval
+        self.rounds = 0
+
+    async def run_forever(self):
+        logging.info("Endpoint prober started")
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logging.exception(f"Endpoint probe round failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self):
+        await asyncio.gather(
+            *[self._probe_mirror(mirror) for mirror in self.registry.mirrors()]
+        )
+        self.rounds += 1
+
+    async def _probe_mirror(self, mirror):
+        started = time.perf_counter()
+        try:
+            ok = await self._probe(mirror.role, mirror.url)
+        except Exception as e:
+            logging.info(f"Probe of {mirror.url} failed: {e}")
+            ok = False
+        self.registry.record(mirror.url, ok, time.perf_counter() - started)
@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlsplit
+from app.fixtures import load_fixture
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+ROLES = {
+    "fojik": "https://fojik.site",
+    "technews": "https://search.technews24.site",
+    "freethemesy": "https://freethemesy.com",
+    "sharelink": "https://sharelink-3.site",
+}
+# Third-party hosts that only serve static assets and have no config setting.
+ASSETS = {"posters": "https://image.tmdb.org"}
+
+
+def sign(stage, value):
+    digest = hashlib.sha1(f"{stage}:{value}".encode()).hexdigest()[:12]
+    return f"{value}.{digest}"
+
+
+def verify(stage, token):
+    value, _, _ = (token or "").rpartition(".")
+    return value if value and sign(stage, value) == token else None
+
+
+class FakeUpstream:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, max_pages=3, seed=None):
+        self.latency = latency
+        self.route_latency = {}
+        self.failures = {}
+        self.max_pages = max_pages
+        self.etags = True
+        self.requests = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+        self._poster = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self):
+        return {role: f"{self.base_url}/{role}" for role in ROLES}
+
+    def configure(self, registry):
+        registry.configure({role: [url] for role, url in self.urls().items()})
+
+    def inject_failure(self, route, status=503, rate=1.0):
+        self.failures[route] = (status, rate)
+
+    def clear_failures(self):
+        self.failures.clear()
+
+    def count(self, route):
+        with self._lock:
+            return sum(1 for logged in self.requests if logged == route)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-upstream", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _rewrite(self, html):
+        for role, live_url in ROLES.items():
+            html = html.replace(live_url, f"{self.base_url}/{role}")
+        for role, live_url in ASSETS.items():
+            html = html.replace(live_url, f"{self.base_url}/{role}")
+        return html
+
+    def _page(self, fixture, **values):
+        return self._rewrite(Template(load_fixture(fixture)).safe_substitute(**values))
+
+    def poster(self):
+        if self._poster is None:
+            out = io.BytesIO()
+            Image.new("RGB", (500, 750), (40, 90, 160)).save(out, "JPEG")
+            self._poster = out.getvalue()
+        return self._poster
+
+    def route(self, method, path, query, form):
+        role, _, rest = path.lstrip("/").partition("/")
+        rest = "/" + rest
+        if role == "posters" and method == "GET":
+            if Image is None:
+                return "poster", 404, "Not Found"
+            return "poster", 200, self.poster()
+        if role == "fojik" and method == "GET":
+            if rest == "/" and "s" in query:
+                return "search", 200, self._page("search_page.html")
+            if rest == "/":
+                return "home", 200, self._page("latest_page.html")
+            if rest.startswith("/page/"):
+                page = int(rest.strip("/").split("/")[-1])
+                if 1 <= page <= self.max_pages:
+                    return "listing", 200, self._page("latest_page.html")
+                return "listing", 404, "Not Found"
+            slug = rest.strip("/")
+            if slug:
+                title = slug.replace("-", " ").title()
+                return (
+                    "movie",
+                    200,
+                    self._page(
+                        "movie_page.html", title=title, fu=sign("fu", slug), fn=slug
+                    ),
+                )
+        if role == "technews" and method == "POST" and rest == "/blog.php":
+            slug = verify("fu", form.get("FU"))
+            if slug is None or slug != form.get("FN"):
+                return "blog", 400, "Invalid request"
+            return "blog", 200, self._page("blog_php.html", fu2=sign("fu2", slug))
+        if role == "freethemesy" and method == "POST" and rest == "/dld.php":
+            slug = verify("fu2", form.get("FU2"))
+            if slug is None:
+                return "dld", 400, "Invalid request"
+            return (
+                "dld",
+                200,
+                self._page("dld_php.html", sss=sign("sss", slug), v=sign("v", slug)),
+            )
+        if role == "freethemesy" and method == "POST" and rest == "/new/l/api/m":
+            slug = verify("sss", form.get("s"))
+            if slug is None or verify("v", form.get("v")) != slug:
+                return "api", 400, "invalid"
+            return "api", 200, f"{self.base_url}/freethemesy/links/{slug}/"
+        if role == "freethemesy" and method == "GET" and rest.startswith("/links/"):
+            return "links", 200, self._page("download_page.html")
+        if role == "sharelink" and method == "GET" and rest.startswith("/s/"):
+            file_id = rest[len("/s/") :].strip("/")
+            return (
+                "share",
+                200,
+                self._page(
+                    "sharelink_start.html", name=file_id, fu5=sign("fu5", file_id)
+                ),
+            )
+        if role == "sharelink" and method == "POST" and rest == "/dld.php":
+            file_id = verify("fu5", form.get("FU5"))
+            if file_id is None:
+                return "share_dld", 400, "Invalid request"
+            return (
+                "share_dld",
+                200,
+                self._page("sharelink_dld.html", fu7=sign("fu7", file_id)),
+            )
+        if role == "sharelink" and method == "POST" and rest == "/blog/":
+            file_id = verify("fu7", form.get("FU7"))
+            if file_id is None:
+                return "share_blog", 400, "Invalid request"
+            return (
+                "share_blog",
+                200,
+                self._page(
+                    "sharelink_blog.html",
+                    sss=sign("ssss", file_id),
+                    v=sign("sv", file_id),
+                ),
+            )
+        if role == "sharelink" and method == "POST" and rest == "/l/api/m":
+            file_id = verify("ssss", form.get("s"))
+            if file_id is None or verify("sv", form.get("v")) != file_id:
+                return "share_api", 400, "invalid"
+            return "share_api", 200, f"{self.base_url}/sharelink/file/{file_id}.mkv"
+        return "unknown", 404, "Not Found"
+
+    def _handler_class(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; with Nagle on, each
+            # keep-alive response stalls on the client's delayed ACK (~40 ms).
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _form(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode() if length else ""
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    return json.loads(body or "{}")
+                return {key: values[0] for key, values in parse_qs(body).items()}
+
+            def _serve(self, method):
+                parts = urlsplit(self.path)
+                query = {
+                    key: values[0] for key, values in parse_qs(parts.query).items()
+                }
+                form = self._form() if method == "POST" else {}
+                try:
+                    route, status, body = upstream.route(
+                        method, parts.path, query, form
+                    )
+                except Exception as e:
+                    route, status, body = "error", 500, f"Internal error: {e}"
+                with upstream._lock:
+                    upstream.requests.append(route)
+                delay = upstream.route_latency.get(route, upstream.latency)
+                if delay:
+                    time.sleep(delay)
+                failure = upstream.failures.get(route)
+                if failure and upstream._random.random() < failure[1]:
+                    status, body = failure[0], "Injected failure"
+                if isinstance(body, bytes):
+                    payload, content_type = body, "image/jpeg"
+                else:
+                    payload, content_type = body.encode(), "text/html; charset=utf-8"
+                etag = None
+                if method == "GET" and status == 200 and upstream.etags:
+                    etag = f'"{hashlib.sha1(payload).hexdigest()[:16]}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        status, payload = 304, b""
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded upstream pages.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    upstream = FakeUpstream(args.host, args.port, latency=args.latency).start()
+    for role, url in upstream.urls().items():
+        print(f"export MLWBD_{role.upper()}_URLS={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        upstream.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import random
+from app.models import MovieSummary
+
+FIXTURES_DIR = os.path.dirname(__file__)
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def synthetic_download_page(episodes, filler=3, inline=False):
+    blocks = ["<h2>Synthetic Season</h2>"]
+    for i in range(1, episodes + 1):
+        if inline:
+            blocks.append(
+                f"<strong>Episode {i}</strong><br>"
+                f'<a href="https://example.test/{i}/480/a">GDrive</a><br>'
+                f"<span>Size {i * 10}MB</span><br>"
+            )
+            continue
+        blocks.append(f"<p><strong>Episode {i}</strong></p>")
+        blocks.extend(
+            f"<p>Mirror note {j} for this episode.</p>" for j in range(filler)
+        )
+        blocks.append(
+            "<ul>"
+            f'<li>480p : <a href="https://example.test/{i}/480/a">GDrive</a> '
+            f'<a href="https://example.test/{i}/480/b">One Drive</a></li>'
+            f'<li>720p : <a href="https://example.test/{i}/720/a">GDrive</a></li>'
+            "</ul>"
+        )
+    return "<html><body><div>" + "\n".join(blocks) + "</div></body></html>"
+
+
+def synthetic_titles(count, vocabulary=8000, seed=1):
+    # Zipf-weighted made-up words plus the release tags real titles carry, so
+    # common trigrams (" 10", "hin", "p.w") are as skewed as on the site.
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = [
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+        for _ in range(vocabulary)
+    ]
+    weights = [1 / rank for rank in range(1, vocabulary + 1)]
+    tags = ["1080p", "720p", "480p", "Hindi", "Dual.Audio", "WEB-DL", "BluRay"]
+    movies = []
+    for i in range(count):
+        name = ".".join(
+            word.title() for word in rng.choices(words, weights, k=rng.randint(2, 5))
+        )
+        title = f"{name}.{rng.randint(1980, 2025)}.{'.'.join(rng.sample(tags, 3))}"
+        movies.append(MovieSummary(title, "", f"https://example.test/m/{i}/"))
+    return movies
+
+
+def synthetic_dld_page(elements, value="token.v", padding=20000):
+    # Obfuscator output: a long hex-escaped string table with the token at
+    # index 18, surrounded by enough markup to make page-wide scans count.
+    strings = [
+        "'" + "".join(f"\\x{ord(c):02x}" for c in f"word{i}") + "'"
+        for i in range(elements)
+    ]
+    strings[18] = f"'{value}'"
+    script = (
+        "var sss = 'token.sss'; var _0x4b21 = document;\n"
+        f"var _0x12fb2a=[{','.join(strings)}];_0x3073=function(a){{return a;}};"
+    )
+    filler = "<p>" + "x" * 80 + "</p>\n"
+    return (
+        f"<html><body>{filler * (padding // 88)}<script>{script}</script></body></html>"
+    )
@@ -0,0 +1,7 @@
+var sss = 'abc.123'; var _0x12fb2a=['\x61\x70\x70\x6c\x79','length','it\'s',"double \"quoted\"",'comma, inside','bracket ] inside','AB','tab\tchar','back\\slash','',"mixed 'quotes'",'last'];_0x3073=function(){};
+var _0xabc = [
+    'first' ,
+    "second",
+    '\x74hird'
+];
+var notThis = ['decoy', 'values']; var _0x9f0e = ['real', 'array', 'here'];
@@ -0,0 +1,187 @@
+import functools
+import hashlib
+import hmac
+import io
+import logging
+import os
+import secrets
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+from reflex.config import get_config
+from app import scraper_config
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def load_secret(path):
+    # Every backend worker sharing the cache directory must sign with the
+    # same key, and it must survive restarts: /img URLs are served immutable.
+    try:
+        with open(path, encoding="ascii") as f:
+            secret = f.read().strip()
+        if secret:
+            return secret
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT, 0o600), "w") as f:
+        f.write(secrets.token_hex(32))
+    try:
+        # link() refuses to replace an existing file, so concurrent workers
+        # all end up reading whichever secret was published first.
+        os.link(tmp_path, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(tmp_path)
+    with open(path, encoding="ascii") as f:
+        return f.read().strip()
+
+
+@functools.cache
+def _secret():
+    if scraper_config.IMAGE_SECRET:
+        return scraper_config.IMAGE_SECRET.encode()
+    path = os.path.join(scraper_config.IMAGE_CACHE_DIR, ".secret")
+    return load_secret(path).encode()
+
+
+def sign_image(url):
+    return hmac.new(_secret(), url.encode(), hashlib.sha256).hexdigest()[:24]
+
+
+def verify_image(url, signature):
+    return hmac.compare_digest(sign_image(url), signature or "")
+
+
+def thumbnail_url(image):
+    if Image is None or not image.startswith(("http://", "https://")):
+        return image
+    query = urlencode({"u": image, "s": sign_image(image)})
+    return f"{get_config().api_url}/img?{query}"
+
+
+def with_thumbnails(movies):
+    # The one place MovieSummary objects become the dicts Reflex state stores.
+    return [
+        {
+            "title": movie.title,
+            "image": movie.image,
+            "link": movie.link,
+            "thumb": thumbnail_url(movie.image),
+        }
+        for movie in movies
+    ]
+
+
+class ThumbnailCache:
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, width=342, quality=75):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.width = width
+        self.quality = quality
+        self._entries = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def key(self, url):
+        return hashlib.sha1(f"{self.width}:{url}".encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.webp")
+
+    def _load(self):
+        # Rebuild the LRU order from mtimes, which get() bumps on every hit.
+        if self._entries is not None:
+            return
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".webp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        files.sort()
+        self._entries = OrderedDict((path, size) for _, path, size in files)
+        self._bytes = sum(self._entries.values())
+
+    def get(self, key):
+        path = self._path(key)
+        with self._lock:
+            self._load()
+            if path not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError as e:
+            logging.warning(f"Thumbnail cache read failed for {path}: {e}")
+            with self._lock:
+                self._bytes -= self._entries.pop(path, 0)
+            return None
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Thumbnail cache write failed for {path}: {e}")
+            return
+        evict = []
+        with self._lock:
+            self._load()
+            self._bytes -= self._entries.pop(path, 0)
+            self._entries[path] = len(data)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_path, size = self._entries.popitem(last=False)
+                self._bytes -= size
+                self.evicted += 1
+                evict.append(old_path)
+        for old_path in evict:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    def render(self, data):
+        with Image.open(io.BytesIO(data)) as image:
+            # draft() lets JPEG decode straight at a reduced scale.
+            image.draft("RGB", (self.width, self.width * 2))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            image.thumbnail((self.width, self.width * 2))
+            out = io.BytesIO()
+            image.save(out, "WEBP", quality=self.quality, method=4)
+            return out.getvalue()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted": self.evicted,
+                "files": len(self._entries or ()),
+                "bytes": self._bytes,
+            }
@@ -0,0 +1,87 @@
+import ast
+import functools
+import re
+
+DLD_SSS = re.compile(r"var sss = '(.*?)'; var")
+BLOG_SSS = re.compile(r"var sss = '(.*?)';")
+BLOG_V = re.compile(r"v: '(.*?)'")
+
+_ANY_ARRAY = re.compile(r"var\s+_0x[a-f0-9]+\s*=\s*\[")
+# One array element: a single- or double-quoted string or a bare token,
+# followed by the separator that ends it.
+_ELEMENT = re.compile(
+    r"""\s*(?:'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)"|([^,\]'"]*?))\s*([,\]])""",
+    re.DOTALL,
+)
+_ESCAPE = re.compile(
+    r"\\(?:x([0-9a-fA-F]{2})|u\{([0-9a-fA-F]+)\}|u([0-9a-fA-F]{4})|(\r\n|[\s\S]))"
+)
+_SIMPLE_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "0": "\0",
+    "\n": "",
+    "\r\n": "",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _named_array(name):
+    # Leading with the literal name lets re skip ahead with a fast substring
+    # search; a leading \b would force a check at every offset of the page.
+    # The lookbehind placed after the name does the word-boundary check.
+    name = re.escape(name)
+    return re.compile(rf"{name}(?<![\w$]{name})\s*=\s*\[")
+
+
+def _unescape_match(match):
+    hex_code, brace_code, unicode_code, char = match.groups()
+    code = hex_code or brace_code or unicode_code
+    if code:
+        return chr(int(code, 16))
+    return _SIMPLE_ESCAPES.get(char, char)
+
+
+def unescape_js(raw):
+    if "\\" not in raw:
+        return raw
+    return _ESCAPE.sub(_unescape_match, raw)
+
+
+def string_array_item(text, index, name=None):
+    # Walk the array literal element by element and decode only the one
+    # requested, instead of capturing and evaluating the whole array.
+    start = (_named_array(name) if name else _ANY_ARRAY).search(text)
+    if start is None:
+        return None
+    pos = start.end()
+    for position in range(index + 1):
+        element = _ELEMENT.match(text, pos)
+        if element is None:
+            return None
+        single, double, bare, end = element.groups()
+        if position == index:
+            if single is not None or double is not None:
+                return unescape_js(single if single is not None else double)
+            return bare or None
+        if end == "]":
+            return None
+        pos = element.end()
+    return None
+
+
+def legacy_array_item(text, index):
+    # Previous capture-and-evaluate approach, kept as the benchmark reference.
+    match = re.search("_0x12fb2a=(.*?);_0x3073", text)
+    if match:
+        captured = match.group(1)
+    else:
+        match = re.search("var\\s+(_0x[a-f0-9]+)\\s*=\\s*(\\[.*?\\]);", text)
+        captured = match.group(2) if match else None
+    if captured is None:
+        return None
+    return ast.literal_eval(captured)[index]
@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+
+class LinkCache:
+    def __init__(self, path, ttl=21600, purge_interval=600):
+        self.path = path
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._local = threading.local()
+        self._purged_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.purged = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS download_links ("
+                "url TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def get(self, url):
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT payload FROM download_links WHERE url = ? AND expires_at > ?",
+                    (url, time.time()),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Link cache read failed for {url}: {e}")
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, url, links, ttl=None):
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO download_links VALUES (?, ?, ?, ?)",
+                    (url, json.dumps(links), now, now + (ttl or self.ttl)),
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Link cache write failed for {url}: {e}")
+            return
+        # Expired rows are never read again; sweep them out every so often
+        # on write so the shared file does not grow without bound.
+        if now - self._purged_at >= self.purge_interval:
+            self._purged_at = now
+            self.purged += self.purge_expired()
+
+    def invalidate(self, url):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM download_links WHERE url = ?", (url,))
+        except sqlite3.Error as e:
+            logging.warning(f"Link cache delete failed for {url}: {e}")
+
+    def purge_expired(self):
+        try:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    "DELETE FROM download_links WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+        except sqlite3.Error as e:
+            logging.warning(f"Link cache purge failed: {e}")
+            return 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "purged": self.purged}
@@ -0,0 +1,117 @@
+import re
+from bs4 import Tag
+from app.models import DownloadLink, LinkGroup
+
+SECTION_TAGS = ["h2", "p", "strong", "em", "span"]
+SECTION_KEYWORDS = ["epi", "batch", "part"]
+
+
+def _has_keyword(text):
+    return any((keyword in text for keyword in SECTION_KEYWORDS))
+
+
+def _ul_links(ul):
+    links = []
+    for li in ul.find_all("li"):
+        label_text = li.get_text(strip=True).split(":")
+        label = label_text[0] if label_text else "Unknown"
+        for a in li.find_all("a"):
+            href = a.get("href")
+            if not href:
+                continue
+            links.append((label, a.get_text(strip=True), href))
+    return links
+
+
+def _segment_children(parent):
+    # Walk the children right to left once. Every child records how many
+    # <ul> blocks follow it before the next h2/p section break, so a header
+    # never has to rescan its siblings.
+    views = {}
+    blocks = []
+    for child in reversed([c for c in parent.children if isinstance(c, Tag)]):
+        views[id(child)] = (blocks, len(blocks))
+        if child.name in ["h2", "p"] and _has_keyword(child.get_text().lower()):
+            blocks = []
+        elif child.name == "ul":
+            blocks.append(_ul_links(child))
+    return views
+
+
+def segment_sections(soup, keep=None):
+    segmented = {}
+    groups = []
+    for tag in soup.find_all(SECTION_TAGS):
+        text = tag.get_text(strip=True)
+        if not (_has_keyword(text.lower()) or tag.name == "h2"):
+            continue
+        parent = tag.parent
+        views = segmented.get(id(parent))
+        if views is None:
+            views = segmented[id(parent)] = _segment_children(parent)
+        blocks, count = views[id(tag)]
+        links = [
+            DownloadLink(label, url, link_type)
+            for block in reversed(blocks[:count])
+            for label, link_type, url in block
+            if keep is None or keep(url)
+        ]
+        if links:
+            groups.append(LinkGroup(text, links))
+    return groups
+
+
+def extract_all_links(soup, keep=None):
+    groups = segment_sections(soup, keep)
+    if groups:
+        return groups
+    fallback = _quality_links(soup, keep)
+    return [LinkGroup("Download Options", fallback)] if fallback else []
+
+
+def keep_download_link(url):
+    return ".me" not in url
+
+
+def _quality_links(soup, keep=None):
+    fallback = []
+    quality_blocks = soup.find_all("p", style=re.compile("text-align: center;"))
+    for block in quality_blocks:
+        text = block.get_text(separator=" ", strip=True)
+        links = block.find_all("a")
+        hrefs = [(a.text.strip(), a.get("href")) for a in links if a.get("href")]
+        if hrefs and any((ext in text for ext in ["480p", "720p", "1080p"])):
+            match = re.search(
+                "([\\d.]+(?:MB|GB).*?(480p|720p|1080p))", text, re.IGNORECASE
+            )
+            quality = match.group(1).strip() if match else "Unknown"
+            fallback.extend(
+                DownloadLink(link_text, link_url, quality)
+                for link_text, link_url in hrefs
+                if keep is None or keep(link_url)
+            )
+    return fallback
+
+
+def legacy_sections(soup):
+    # Original sibling-rescanning implementation, kept as the parity
+    # reference for tests and benchmarks.
+    results = []
+    for tag in soup.find_all(SECTION_TAGS):
+        text = tag.get_text(strip=True)
+        if _has_keyword(text.lower()) or tag.name == "h2":
+            title = text
+            links = []
+            next_sibling = tag.find_next_sibling()
+            while next_sibling:
+                if next_sibling.name in ["h2", "p"] and _has_keyword(
+                    next_sibling.get_text().lower()
+                ):
+                    break
+                if next_sibling.name == "ul":
+                    for label, link_type, url in _ul_links(next_sibling):
+                        links.append(DownloadLink(label, url, link_type))
+                next_sibling = next_sibling.find_next_sibling()
+            if links:
+                results.append(LinkGroup(title, links))
+    return results
@@ -0,0 +1,87 @@
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+from app.models import MovieSummary
+
+try:
+    import lxml.html
+    from lxml.etree import ParserError
+except ImportError:
+    lxml = None
+
+_ARTICLES = SoupStrainer("article")
+_TITLE_DIV = (
+    "descendant::div[contains(concat(' ', normalize-space(@class), ' '), ' title ')][1]"
+)
+
+
+def _soup_movie(movie_div, strip_alt):
+    title_div = movie_div.find("div", class_="title")
+    a_tag = title_div.find("a") if title_div else movie_div.find("a", href=True)
+    img_tag = movie_div.find("img", src=True)
+    if a_tag:
+        title = a_tag.get_text(strip=True)
+    elif img_tag and img_tag.get("alt"):
+        title = img_tag["alt"].strip() if strip_alt else img_tag["alt"]
+    else:
+        title = ""
+    link = a_tag["href"] if a_tag else ""
+    image = img_tag["src"] if img_tag else ""
+    return title, image, link
+
+
+def _lxml_movie(movie_div, strip_alt):
+    title_div = movie_div.xpath(_TITLE_DIV)
+    if title_div:
+        a_tags = title_div[0].xpath("descendant::a[1]")
+    else:
+        a_tags = movie_div.xpath("descendant::a[@href][1]")
+    a_tag = a_tags[0] if a_tags else None
+    img_tags = movie_div.xpath("descendant::img[@src][1]")
+    img_tag = img_tags[0] if img_tags else None
+    if a_tag is not None:
+        title = "".join(text.strip() for text in a_tag.itertext())
+    elif img_tag is not None and img_tag.get("alt"):
+        title = img_tag.get("alt").strip() if strip_alt else img_tag.get("alt")
+    else:
+        title = ""
+    link = a_tag.attrib["href"] if a_tag is not None else ""
+    image = img_tag.get("src") if img_tag is not None else ""
+    return title, image, link
+
+
+def _collect(movie_divs, extract, strip_alt):
+    results = []
+    for movie_div in movie_divs:
+        try:
+            title, image, link = extract(movie_div, strip_alt)
+        except Exception as inner_e:
+            logging.exception(f"Skipping a movie element due to parse error: {inner_e}")
+            continue
+        if title and link:
+            results.append(MovieSummary(title, image, link))
+    return results
+
+
+def parse_listing_lxml(html, strip_alt=True):
+    try:
+        doc = lxml.html.fromstring(html)
+    except ParserError:
+        return []
+    return _collect(doc.iter("article"), _lxml_movie, strip_alt)
+
+
+def parse_listing_soup(html, strip_alt=True):
+    soup = BeautifulSoup(html, "html.parser", parse_only=_ARTICLES)
+    return _collect(soup.find_all("article"), _soup_movie, strip_alt)
+
+
+def parse_listing_full(html, strip_alt=True):
+    # Whole-document parse kept as the reference for parity checks and benchmarks.
+    soup = BeautifulSoup(html, "html.parser")
+    return _collect(soup.find_all("article"), _soup_movie, strip_alt)
+
+
+def parse_listing(html, strip_alt=True):
+    if lxml is not None:
+        return parse_listing_lxml(html, strip_alt)
+    return parse_listing_soup(html, strip_alt)
@@ -0,0 +1,206 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + inner + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(label, "")) for label in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(str(labels.get(label, "")) for label in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(label, "")) for label in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels):
+        key = tuple(str(labels.get(label, "")) for label in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = [
+                (key, list(state[0]), state[1], state[2])
+                for key, state in self._values.items()
+            ]
+        for key, counts, total, count in items:
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket",
+                    labels + (("le", _format_value(bound)),),
+                    cumulative,
+                )
+            yield f"{self.name}_bucket", labels + (("le", "+Inf"),), count
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class Gauges:
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames, collect):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._collect = collect
+
+    def samples(self):
+        for key, value in self._collect():
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauges(self, name, help, labelnames, collect):
+        return self._register(Gauges(name, help, labelnames, collect))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HOP_SECONDS = REGISTRY.histogram(
+    "mlwbd_hop_seconds",
+    "Time spent on one hop of a scrape chain, including retries and parsing.",
+    ["chain", "step", "host"],
+)
+HOP_ERRORS = REGISTRY.counter(
+    "mlwbd_hop_errors_total",
+    "Scrape chain hops that failed, by reason.",
+    ["chain", "step", "host", "reason"],
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "mlwbd_request_attempt_seconds",
+    "Duration of a single upstream HTTP attempt.",
+    ["host", "method", "outcome"],
+)
+REQUEST_QUEUE_SECONDS = REGISTRY.histogram(
+    "mlwbd_request_queue_seconds",
+    "Time an upstream attempt waited for its host's scheduler slot.",
+    ["host", "priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_ERRORS = REGISTRY.counter(
+    "mlwbd_request_errors_total",
+    "Upstream HTTP attempts that raised, by error type.",
+    ["host", "kind"],
+)
+
+
+class HopSpan:
+    __slots__ = ("reason",)
+
+    def __init__(self):
+        self.reason = None
+
+    def fail(self, reason):
+        self.reason = reason
+
+
+@contextmanager
+def hop_span(chain, step, host=""):
+    span = HopSpan()
+    start = time.perf_counter()
+    try:
+        yield span
+    except Exception as e:
+        if span.reason is None:
+            span.fail(type(e).__name__)
+        raise
+    finally:
+        HOP_SECONDS.observe(
+            time.perf_counter() - start, chain=chain, step=step, host=host
+        )
+        if span.reason:
+            HOP_ERRORS.inc(chain=chain, step=step, host=host, reason=span.reason)
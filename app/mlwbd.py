@@ -1,12 +1,53 @@
+import asyncio
 import cloudscraper
-import re
-import ast
-import json
+import functools
 import logging
 import time
 import random
-from bs4 import BeautifulSoup
-from requests.exceptions import Timeout, ConnectionError, HTTPError, RequestException
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from requests.exceptions import HTTPError
+from app import scraper_config
+from app.catalog import Catalog, CatalogCrawler, PageUnavailable
+from app.clearance import ClearanceStore, apply_clearance, session_clearance
+from app.conditional import ConditionalCache
+from app.endpoints import EndpointProber, EndpointRegistry
+from app.image_proxy import ThumbnailCache
+from app.link_cache import LinkCache
+from app.js_scan import BLOG_SSS, BLOG_V, DLD_SSS, string_array_item
+
+# Kept importable from here; they live in link_parser so parse workers can
+# use them without loading this module.
+from app.link_parser import extract_all_links
+from app.metrics import (
+    HOP_ERRORS,
+    REGISTRY,
+    REQUEST_ERRORS,
+    REQUEST_QUEUE_SECONDS,
+    REQUEST_SECONDS,
+    hop_span,
+)
+from app.models import LinkGroup, MovieSummary
+from app.parse_pool import ParsePool, hidden_inputs, link_rows, listing_rows
+from app.prefetch import PagePrefetcher
+from app.result_cache import TTLCache
+from app.retry import (
+    CircuitBreakers,
+    RetryPolicy,
+    is_host_failure,
+    is_session_failure,
+)
+from app.scheduler import (
+    BACKGROUND,
+    PRIORITY,
+    PRIORITY_NAMES,
+    RequestScheduler,
+    request_priority,
+)
+from app.session_pool import SessionPool
+from app.singleflight import SingleFlight
+from app.trigram import TrigramIndex
 
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
@@ -39,138 +80,477 @@ def get_scraper():
     return scraper
 
 
-def request_with_retry(scraper, method, url, max_retries=4, timeout=45, **kwargs):
-    for attempt in range(max_retries + 1):
+SESSION_POOL = SessionPool(get_scraper, max_size=8, max_age=900)
+HTTP_EXECUTOR = ThreadPoolExecutor(
+    scraper_config.HTTP_WORKERS, thread_name_prefix="mlwbd-http"
+)
+CLEARANCE = ClearanceStore(
+    scraper_config.CLEARANCE_PATH,
+    ttl=scraper_config.CLEARANCE_TTL,
+    lease_ttl=scraper_config.CLEARANCE_LEASE,
+)
+CLEARANCE_POLL_INTERVAL = 0.1
+SCHEDULER = RequestScheduler(
+    rate=scraper_config.HOST_RATE,
+    burst=scraper_config.HOST_BURST,
+    concurrency=scraper_config.HOST_CONCURRENCY,
+)
+ENDPOINTS = EndpointRegistry(
+    scraper_config.UPSTREAM_MIRRORS,
+    scraper_config.UPSTREAM_ALIASES,
+    failure_threshold=scraper_config.ENDPOINT_FAILURE_THRESHOLD,
+    recovery_time=scraper_config.ENDPOINT_RECOVERY_TIME,
+)
+ENDPOINT_PROBER = EndpointProber(
+    ENDPOINTS,
+    lambda role, url: _probe_endpoint(role, url),
+    interval=scraper_config.ENDPOINT_PROBE_INTERVAL,
+)
+RETRY_POLICY = RetryPolicy(
+    max_attempts=scraper_config.RETRY_MAX_ATTEMPTS,
+    deadline=scraper_config.RETRY_DEADLINE,
+    attempt_timeout=scraper_config.RETRY_ATTEMPT_TIMEOUT,
+)
+CIRCUIT_BREAKERS = CircuitBreakers(
+    failure_threshold=scraper_config.BREAKER_FAILURE_THRESHOLD,
+    recovery_time=scraper_config.BREAKER_RECOVERY_TIME,
+)
+SEARCH_CACHE = TTLCache(
+    ttl=scraper_config.SEARCH_CACHE_TTL,
+    max_entries=scraper_config.SEARCH_CACHE_SIZE,
+    stale_ttl=scraper_config.CACHE_STALE_TTL,
+)
+LINK_CACHE = LinkCache(
+    scraper_config.LINK_CACHE_PATH,
+    ttl=scraper_config.LINK_CACHE_TTL,
+    purge_interval=scraper_config.LINK_CACHE_PURGE_INTERVAL,
+)
+LATEST_CACHE = TTLCache(
+    ttl=scraper_config.LATEST_CACHE_TTL,
+    max_entries=scraper_config.LATEST_CACHE_SIZE,
+    stale_ttl=scraper_config.CACHE_STALE_TTL,
+)
+PARSE_POOL = ParsePool(workers=scraper_config.PARSE_WORKERS)
+CONDITIONAL = ConditionalCache(max_entries=scraper_config.CONDITIONAL_CACHE_SIZE)
+SEARCH_FLIGHT = SingleFlight()
+LINKS_FLIGHT = SingleFlight()
+MAIN_LINK_FLIGHT = SingleFlight()
+CATALOG = Catalog(
+    scraper_config.CATALOG_PATH, stale_ttl=scraper_config.CATALOG_STALE_TTL
+)
+CATALOG_CRAWLER = CatalogCrawler(
+    CATALOG,
+    lambda page: _in_background(_crawl_latest_movies(page)),
+    page_interval=scraper_config.CATALOG_PAGE_INTERVAL,
+    cycle_interval=scraper_config.CATALOG_CYCLE_INTERVAL,
+    pages_per_cycle=scraper_config.CATALOG_PAGES_PER_CYCLE,
+    max_pages=scraper_config.CATALOG_MAX_PAGES,
+)
+THUMBNAILS = ThumbnailCache(
+    scraper_config.IMAGE_CACHE_DIR,
+    max_bytes=scraper_config.IMAGE_CACHE_MAX_BYTES,
+    width=scraper_config.IMAGE_THUMB_WIDTH,
+    quality=scraper_config.IMAGE_QUALITY,
+)
+THUMBNAIL_FLIGHT = SingleFlight()
+TITLE_INDEX = TrigramIndex(max_entries=scraper_config.TITLE_INDEX_SIZE)
+PREFETCHER = PagePrefetcher(
+    lambda page: _in_background(_fetch_latest_movies(page)),
+    LATEST_CACHE,
+    depth=scraper_config.PREFETCH_DEPTH,
+    max_page=scraper_config.PREFETCH_MAX_PAGE,
+    max_inflight=scraper_config.PREFETCH_MAX_INFLIGHT,
+)
+
+REGISTRY.gauges(
+    "mlwbd_cache_events",
+    "Result cache counters and sizes.",
+    ["cache", "event"],
+    lambda: [
+        ((name, event), value)
+        for name, cache in [
+            ("search", SEARCH_CACHE),
+            ("latest", LATEST_CACHE),
+            ("links", LINK_CACHE),
+            ("clearance", CLEARANCE),
+            ("conditional", CONDITIONAL),
+            ("catalog", CATALOG),
+            ("thumbnails", THUMBNAILS),
+        ]
+        for event, value in cache.stats().items()
+    ],
+)
+REGISTRY.gauges(
+    "mlwbd_singleflight_calls",
+    "Single-flight executions and coalesced callers.",
+    ["flight", "event"],
+    lambda: [
+        ((name, event), value)
+        for name, flight in [
+            ("search", SEARCH_FLIGHT),
+            ("download_links", LINKS_FLIGHT),
+            ("main_link", MAIN_LINK_FLIGHT),
+            ("thumbnail", THUMBNAIL_FLIGHT),
+        ]
+        for event, value in flight.stats().items()
+    ],
+)
+REGISTRY.gauges(
+    "mlwbd_catalog_crawler",
+    "Background catalog crawler progress.",
+    ["event"],
+    lambda: [((event,), value) for event, value in CATALOG_CRAWLER.stats().items()],
+)
+REGISTRY.gauges(
+    "mlwbd_title_index",
+    "Fuzzy title index size and lookups.",
+    ["event"],
+    lambda: [((event,), value) for event, value in TITLE_INDEX.stats().items()],
+)
+REGISTRY.gauges(
+    "mlwbd_endpoint_health",
+    "Per-mirror health, smoothed latency and error rate.",
+    ["role", "mirror", "event"],
+    lambda: [
+        ((role, url, event), value)
+        for (role, url), stats in ENDPOINTS.stats().items()
+        for event, value in stats.items()
+    ],
+)
+REGISTRY.gauges(
+    "mlwbd_parse_pool",
+    "HTML parses offloaded to worker processes or run inline.",
+    ["event"],
+    lambda: [((event,), value) for event, value in PARSE_POOL.stats().items()],
+)
+REGISTRY.gauges(
+    "mlwbd_session_pool",
+    "Scraper session pool state.",
+    ["event"],
+    lambda: [((event,), value) for event, value in SESSION_POOL.stats().items()],
+)
+REGISTRY.gauges(
+    "mlwbd_scheduler",
+    "Per-host request scheduler queue, in-flight and grant counts.",
+    ["host", "event"],
+    lambda: [
+        ((host, event), value)
+        for host, stats in SCHEDULER.stats().items()
+        for event, value in stats.items()
+    ],
+)
+REGISTRY.gauges(
+    "mlwbd_circuit_open",
+    "1 when the host's circuit breaker is not closed.",
+    ["host"],
+    lambda: [
+        ((host,), int(state["state"] != "closed"))
+        for host, state in CIRCUIT_BREAKERS.stats().items()
+    ],
+)
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="mlwbd-loop", daemon=True
+            ).start()
+    return _loop
+
+
+def run_sync(coro):
+    # cloudscraper is blocking, so the async engine hands each request to a
+    # worker thread; sync callers drive it on a shared background loop.
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+async def _blocking_http(fn, *args, **kwargs):
+    # Slow or challenged upstream calls must not starve the default executor,
+    # which the cache, catalog and clearance lookups run on.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        HTTP_EXECUTOR, functools.partial(fn, *args, **kwargs)
+    )
+
+
+def request_with_retry(scraper, method, url, policy=None, **kwargs):
+    return run_sync(async_request_with_retry(scraper, method, url, policy, **kwargs))
+
+
+def _host(url):
+    return urlsplit(url).netloc
+
+
+def _describe_error(error):
+    if isinstance(error, HTTPError) and error.response is not None:
+        return f"HTTP error {error.response.status_code}"
+    return f"{type(error).__name__}: {error}"
+
+
+async def async_request_with_retry(
+    scraper, method, url, policy=None, accept=(), **kwargs
+):
+    # Urls on a configured mirror fail over to the same path on the next
+    # healthy mirror when the host itself is down; a 404 does not fail over.
+    # Statuses in `accept` come back as responses instead of failures.
+    for candidate in ENDPOINTS.failover(url):
+        hostname = urlsplit(candidate).hostname or ""
+        before = session_clearance(scraper, hostname)
+        lease = None if before else await _adopt_clearance(scraper, hostname)
+        response, host_down, answered = None, True, False
         try:
-            logging.info(f"Request attempt {attempt + 1}/{max_retries + 1} for {url}")
-            if method.lower() == "post":
-                response = scraper.post(url, timeout=timeout, **kwargs)
-            else:
-                response = scraper.get(url, timeout=timeout, **kwargs)
-            if response.status_code != 200:
-                logging.warning(f"Non-200 status code {response.status_code} for {url}")
-            response.raise_for_status()
-            return response
-        except Timeout:
-            logging.error(f"Timeout error on attempt {attempt + 1} for {url}")
-            if attempt == max_retries:
-                logging.exception(f"Max retries reached (Timeout) for {url}")
-                return None
-        except ConnectionError:
-            logging.error(f"Connection error on attempt {attempt + 1} for {url}")
-            if attempt == max_retries:
-                logging.exception(f"Max retries reached (ConnectionError) for {url}")
-                return None
-        except HTTPError as e:
-            logging.error(
-                f"HTTP error {(e.response.status_code if e.response else 'unknown')} on attempt {attempt + 1} for {url}"
+            response, host_down, answered = await _request_with_retry(
+                scraper, method, candidate, policy, accept, **kwargs
             )
-            if attempt == max_retries:
-                logging.exception(f"Max retries reached (HTTPError) for {url}")
-                return None
-        except Exception as e:
-            logging.error(f"General error on attempt {attempt + 1} for {url}: {e}")
-            if attempt == max_retries:
-                logging.exception(f"Max retries reached (General) for {url}")
-                return None
-        sleep_time = 2 ** (attempt + 1)
-        logging.info(f"Retrying in {sleep_time} seconds...")
-        time.sleep(sleep_time)
+        finally:
+            await asyncio.to_thread(
+                _publish_clearance, scraper, hostname, before, lease, answered
+            )
+        if response is not None or not host_down:
+            return response
     return None
 
 
-def extract_all_links(soup):
-    results = []
-    for tag in soup.find_all(["h2", "p", "strong", "em", "span"]):
-        text = tag.get_text(strip=True)
-        if (
-            any((keyword in text.lower() for keyword in ["epi", "batch", "part"]))
-            or tag.name == "h2"
-        ):
-            title = text
-            links = []
-            next_sibling = tag.find_next_sibling()
-            while next_sibling:
-                if next_sibling.name in ["h2", "p"] and any(
-                    (
-                        kw in next_sibling.get_text().lower()
-                        for kw in ["epi", "batch", "part"]
-                    )
-                ):
-                    break
-                if next_sibling.name == "ul":
-                    for li in next_sibling.find_all("li"):
-                        label_text = li.get_text(strip=True).split(":")
-                        label = label_text[0] if label_text else "Unknown"
-                        for a in li.find_all("a"):
-                            href = a.get("href")
-                            if not href:
-                                continue
-                            links.append(
-                                {
-                                    "label": label,
-                                    "type": a.get_text(strip=True),
-                                    "url": href,
-                                }
-                            )
-                next_sibling = next_sibling.find_next_sibling()
-            if links:
-                results.append({"title": title, "links": links})
-    if not results:
-        fallback = []
-        quality_blocks = soup.find_all("p", style=re.compile("text-align: center;"))
-        for block in quality_blocks:
-            text = block.get_text(separator=" ", strip=True)
-            links = block.find_all("a")
-            hrefs = [(a.text.strip(), a.get("href")) for a in links if a.get("href")]
-            if hrefs and any((ext in text for ext in ["480p", "720p", "1080p"])):
-                match = re.search(
-                    "([\\d.]+(?:MB|GB).*?(480p|720p|1080p))", text, re.IGNORECASE
+async def _adopt_clearance(scraper, hostname):
+    # Reuse a Cloudflare clearance any worker already paid for. Without one,
+    # the caller that gets the lease solves the challenge while the others
+    # wait for it to publish the cookies.
+    user_agent = scraper.headers.get("User-Agent", "")
+    deadline = time.monotonic() + CLEARANCE.lease_ttl
+    waited = False
+    while True:
+        rows = await asyncio.to_thread(CLEARANCE.get, hostname, user_agent)
+        if rows is not None:
+            apply_clearance(scraper, rows)
+            return None
+        lease = await asyncio.to_thread(CLEARANCE.acquire, hostname, user_agent)
+        if lease is not None and waited:
+            # The holder gave up without hearing from the host; there is
+            # nothing to wait for, so don't queue behind the lease one by one.
+            await asyncio.to_thread(CLEARANCE.release, hostname, user_agent, lease)
+            return None
+        if lease is not None or time.monotonic() >= deadline:
+            return lease
+        waited = True
+        await asyncio.sleep(CLEARANCE_POLL_INTERVAL)
+
+
+def _publish_clearance(scraper, hostname, before, lease, answered):
+    user_agent = scraper.headers.get("User-Agent", "")
+    rows = session_clearance(scraper, hostname)
+    if rows and rows != before:
+        logging.info(f"Storing Cloudflare clearance for {hostname}")
+        CLEARANCE.put(hostname, user_agent, rows)
+    elif lease is not None and answered:
+        # The host sent a status without a challenge, even if it was a 4xx;
+        # an empty entry lets other workers skip the lease until it expires.
+        CLEARANCE.put(hostname, user_agent, rows)
+    if lease is not None:
+        CLEARANCE.release(hostname, user_agent, lease)
+
+
+async def _request_with_retry(scraper, method, url, policy=None, accept=(), **kwargs):
+    policy = policy or RETRY_POLICY
+    host = _host(url)
+    breaker = CIRCUIT_BREAKERS.get(host)
+    send = scraper.post if method.lower() == "post" else scraper.get
+    deadline = time.monotonic() + policy.deadline
+    delay = policy.base_delay
+    host_down = False
+    answered = False
+    session_failed = False
+    for attempt in range(policy.max_attempts):
+        if not breaker.allow():
+            logging.warning(f"Circuit open for {host}, skipping {url}")
+            REQUEST_ERRORS.inc(host=host, kind="CircuitOpen")
+            return None, True, answered
+        try:
+            # Queue behind the host's token bucket and concurrency cap; the
+            # retry backoff below runs outside the slot.
+            async with SCHEDULER.slot(host) as waited:
+                REQUEST_QUEUE_SECONDS.observe(
+                    waited, host=host, priority=PRIORITY_NAMES[PRIORITY.get()]
                 )
-                quality = match.group(1).strip() if match else "Unknown"
-                for link_text, link_url in hrefs:
-                    fallback.append(
-                        {"quality": quality, "type": link_text, "link": link_url}
+                timeout = min(policy.attempt_timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    logging.error(f"Deadline exhausted while queued for {url}")
+                    breaker.abandon()
+                    break
+                started = time.perf_counter()
+                try:
+                    logging.info(
+                        f"Request attempt {attempt + 1}/{policy.max_attempts} for {url}"
                     )
-        return fallback
-    return results
+                    response = await _blocking_http(
+                        send, url, timeout=timeout, **kwargs
+                    )
+                    answered = True
+                    status = response.status_code
+                    if status not in (200, 304, *accept):
+                        logging.warning(f"Non-200 status code {status} for {url}")
+                        response.raise_for_status()
+                    elapsed = time.perf_counter() - started
+                    breaker.record_success()
+                    if status < 400:
+                        ENDPOINTS.record(url, True, elapsed)
+                    REQUEST_SECONDS.observe(
+                        elapsed, host=host, method=method, outcome="ok"
+                    )
+                    return response, False, True
+                except Exception as e:
+                    elapsed = time.perf_counter() - started
+                    REQUEST_SECONDS.observe(
+                        elapsed, host=host, method=method, outcome="error"
+                    )
+                    REQUEST_ERRORS.inc(host=host, kind=type(e).__name__)
+                    retryable = policy.is_retryable(e)
+                    host_down = is_host_failure(e)
+                    session_failed = session_failed or is_session_failure(e)
+                    if host_down:
+                        breaker.record_failure()
+                        ENDPOINTS.record(url, False)
+                    else:
+                        # The host is up, but a 4xx or a challenge says
+                        # nothing about whether this mirror still serves the
+                        # site (a parked domain 404s quickly), so the mirror
+                        # is neither credited nor failed.
+                        breaker.record_success()
+                    logging.error(
+                        f"{_describe_error(e)} on attempt {attempt + 1} for {url}"
+                        f"{'' if retryable else ' (not retryable)'}"
+                    )
+                    if not retryable:
+                        break
+        except asyncio.CancelledError:
+            breaker.abandon()
+            raise
+        delay = policy.next_delay(delay)
+        if attempt + 1 == policy.max_attempts:
+            break
+        if time.monotonic() + delay >= deadline:
+            logging.error(f"Deadline exhausted for {url}")
+            break
+        logging.info(f"Retrying in {delay:.1f} seconds...")
+        await asyncio.sleep(delay)
+    logging.error(f"Giving up on {url}")
+    if session_failed:
+        SESSION_POOL.mark_failed(scraper)
+    return None, host_down, answered
+
+
+async def _probe_endpoint(role, url):
+    # One bare request per round: no retries and no circuit breaker, so a
+    # recovered mirror is noticed on the next probe.
+    with SESSION_POOL.session() as scraper:
+        async with SCHEDULER.slot(_host(url), BACKGROUND):
+            response = await _blocking_http(
+                scraper.get, f"{url}/", timeout=scraper_config.ENDPOINT_PROBE_TIMEOUT
+            )
+    if role == "fojik":
+        # Search, listings and movie pages all route here, so the mirror has
+        # to serve the real site: a parked or moved domain answers too.
+        return response.status_code == 200 and bool(
+            await _parse(listing_rows, response)
+        )
+    return response.status_code < 500
+
+
+async def _in_background(coro):
+    # Prefetch and crawl requests yield to ones a user is waiting on.
+    with request_priority(BACKGROUND):
+        return await coro
+
+
+async def run_endpoint_prober():
+    if not scraper_config.ENDPOINT_PROBE:
+        return
+    await ENDPOINT_PROBER.run_forever()
+
+
+def is_movie_url(url):
+    return ENDPOINTS.owns(url, "fojik")
+
+
+async def _parse(fn, response, *args):
+    # Parsers get the raw body; decoding happens in the worker as well.
+    return await PARSE_POOL.run(fn, response.content, response.encoding, *args)
+
+
+async def _parse_listing(response, strip_alt=True):
+    rows = await _parse(listing_rows, response, strip_alt)
+    return [MovieSummary(title, image, link) for title, image, link in rows]
+
+
+async def run_parse_pool():
+    PARSE_POOL.start()
 
 
 def search_movie(text):
+    return run_sync(async_search_movie(text))
+
+
+def normalize_query(text):
+    return " ".join(text.lower().split())
+
+
+async def async_search_movie(text):
+    key = normalize_query(text)
+    hits = await asyncio.to_thread(_search_catalog, key)
+    if hits:
+        logging.info(f"Serving search for {key!r} from the catalog")
+        TITLE_INDEX.add(hits)
+        return hits
+    results = await SEARCH_CACHE.get_or_load(
+        key, lambda: SEARCH_FLIGHT.do(key, lambda: _fetch_search(text))
+    )
+    if results:
+        TITLE_INDEX.add(results)
+        return list(results)
+    matches = TITLE_INDEX.search(key)
+    if matches:
+        logging.info(
+            f"No upstream results for {key!r}, serving {len(matches)} fuzzy matches"
+        )
+    return matches
+
+
+def _search_catalog(text):
+    if not CATALOG.is_fresh():
+        return []
+    return CATALOG.search(text)
+
+
+async def _fetch_search(text):
+    with SESSION_POOL.session() as scraper:
+        results = await _search_movie(scraper, text)
+    await asyncio.to_thread(CATALOG.upsert, results)
+    return results
+
+
+async def _search_movie(scraper, text):
     try:
-        scraper = get_scraper()
         params = {"s": text}
+        url = f"{ENDPOINTS.url('fojik')}/"
         logging.info(f"Searching for movie: {text}")
-        resp = request_with_retry(scraper, "get", "https://fojik.site/", params=params)
+        resp = await async_request_with_retry(
+            scraper,
+            "get",
+            url,
+            params=params,
+            headers=CONDITIONAL.headers((url, text)),
+        )
         if not resp:
             logging.error("No response received from search")
             return []
-        soup = BeautifulSoup(resp.text, "html.parser")
-        movies_div = soup.find_all("article")
-        logging.info(f"Found {len(movies_div)} article elements in search results")
-        results = []
-        for movie_div in movies_div:
-            try:
-                title_div = movie_div.find("div", class_="title")
-                a_tag = (
-                    title_div.find("a") if title_div else movie_div.find("a", href=True)
-                )
-                img_tag = movie_div.find("img", src=True)
-                if a_tag:
-                    title = a_tag.get_text(strip=True)
-                elif img_tag and img_tag.get("alt"):
-                    title = img_tag["alt"]
-                else:
-                    title = ""
-                link = a_tag["href"] if a_tag else ""
-                image = img_tag["src"] if img_tag else ""
-                if title and link:
-                    results.append({"title": title, "image": image, "link": link})
-            except Exception as inner_e:
-                logging.exception(
-                    f"Skipping a movie element due to parse error: {inner_e}"
-                )
-                continue
+        results = await CONDITIONAL.resolve(
+            (url, text), resp, lambda response: _parse_listing(response, False)
+        )
         logging.info(f"Successfully parsed {len(results)} movies from search")
         return results
     except Exception as e:
@@ -179,143 +559,232 @@ def search_movie(text):
 
 
 def get_latest_movies(page=1):
-    scraper = get_scraper()
-    url = f"https://fojik.site/page/{page}/"
+    return run_sync(async_get_latest_movies(page))
+
+
+async def async_get_latest_movies(page=1):
+    page = int(page)
+    await PREFETCHER.wait(page)
+    results = await LATEST_CACHE.get_or_load(page, lambda: _fetch_latest_movies(page))
+    if results:
+        TITLE_INDEX.add(results)
+        PREFETCHER.schedule(page)
+    return list(results)
+
+
+async def _fetch_latest_movies(page):
+    with SESSION_POOL.session() as scraper:
+        return await _get_latest_movies(scraper, page)
+
+
+async def _get_latest_movies(scraper, page):
+    url = f"{ENDPOINTS.url('fojik')}/page/{page}/"
     try:
-        resp = request_with_retry(scraper, "get", url)
-        soup = BeautifulSoup(resp.text, "html.parser")
-        movies_div = soup.find_all("article")
-        results = []
-        for movie_div in movies_div:
-            title_div = movie_div.find("div", class_="title")
-            a_tag = title_div.find("a") if title_div else movie_div.find("a", href=True)
-            img_tag = movie_div.find("img", src=True)
-            if a_tag:
-                title = a_tag.get_text(strip=True)
-            elif img_tag and img_tag.get("alt"):
-                title = img_tag["alt"].strip()
-            else:
-                title = ""
-            link = a_tag["href"] if a_tag else ""
-            image = img_tag["src"] if img_tag else ""
-            if title and link:
-                results.append({"title": title, "image": image, "link": link})
-        return results
+        resp = await async_request_with_retry(
+            scraper, "get", url, headers=CONDITIONAL.headers(url)
+        )
+        return await CONDITIONAL.resolve(url, resp, _parse_listing)
     except Exception as e:
         logging.exception(f"Error fetching latest movies: {e}")
         return []
 
 
+async def _crawl_latest_movies(page):
+    # Unlike _fetch_latest_movies, a failed fetch must not read as the end of
+    # the listing: only a 404 past the last page does.
+    url = f"{ENDPOINTS.url('fojik')}/page/{page}/"
+    with SESSION_POOL.session() as scraper:
+        resp = await async_request_with_retry(
+            scraper, "get", url, accept=(404,), headers=CONDITIONAL.headers(url)
+        )
+    if resp is None:
+        raise PageUnavailable(f"listing page {page} could not be fetched")
+    if resp.status_code == 404:
+        return []
+    movies = await CONDITIONAL.resolve(url, resp, _parse_listing)
+    if not movies:
+        raise PageUnavailable(f"listing page {page} had no movies")
+    return movies
+
+
+async def run_catalog_crawler():
+    if not scraper_config.CATALOG_CRAWL:
+        return
+    await CATALOG_CRAWLER.run_forever()
+
+
+async def async_get_thumbnail(url):
+    key = THUMBNAILS.key(url)
+    data = await asyncio.to_thread(THUMBNAILS.get, key)
+    if data is None:
+        data = await THUMBNAIL_FLIGHT.do(key, lambda: _fetch_thumbnail(url, key))
+    return data
+
+
+async def _fetch_thumbnail(url, key):
+    with hop_span("thumbnail", "poster", _host(url)) as span:
+        with SESSION_POOL.session() as scraper:
+            response = await async_request_with_retry(
+                scraper, "get", url, headers={"Referer": f"{ENDPOINTS.url('fojik')}/"}
+            )
+        if not response:
+            span.fail("request")
+            return None
+        if len(response.content) > scraper_config.IMAGE_MAX_SOURCE_BYTES:
+            logging.warning(f"Poster too large to thumbnail: {url}")
+            span.fail("too_large")
+            return None
+        try:
+            data = await asyncio.to_thread(THUMBNAILS.render, response.content)
+        except Exception as e:
+            logging.warning(f"Could not thumbnail poster {url}: {e}")
+            span.fail("parse")
+            return None
+    await asyncio.to_thread(THUMBNAILS.put, key, data)
+    return data
+
+
 def get_download_links(url):
-    scraper = get_scraper()
+    return run_sync(async_get_download_links(url))
+
+
+async def async_get_download_links(url):
+    cached = _cached_groups(await asyncio.to_thread(LINK_CACHE.get, url))
+    if cached is not None:
+        logging.info(f"Serving cached download links for: {url}")
+        return cached
+    return await LINKS_FLIGHT.do(url, lambda: _fetch_download_links(url))
+
+
+async def _fetch_download_links(url):
+    with SESSION_POOL.session() as scraper:
+        links = await _get_download_links(scraper, url)
+    if links:
+        rows = [group.to_row() for group in links]
+        await asyncio.to_thread(LINK_CACHE.set, url, rows)
+    return links
+
+
+def _cached_groups(rows):
+    if rows is None:
+        return None
+    try:
+        return [LinkGroup.from_row(row) for row in rows]
+    except (TypeError, ValueError):
+        # Entry written in the old dict layout; refetch and overwrite it.
+        return None
+
+
+async def _get_download_links(scraper, url):
     logging.info(f"Starting download link extraction for: {url}")
     try:
-        response = request_with_retry(scraper, "get", url)
-        if not response:
-            logging.error(f"Failed to load initial URL: {url}")
-            return []
-        soup = BeautifulSoup(response.text, "html.parser")
-        fu_input = soup.find("input", {"type": "hidden", "name": "FU"})
-        fn_input = soup.find("input", {"type": "hidden", "name": "FN"})
-        if not fu_input or not fn_input:
-            logging.error("Could not find FU or FN inputs on initial page")
-            return []
-        FU = fu_input["value"]
-        FN = fn_input["value"]
-        logging.info("Step 1: Found FU and FN inputs")
-        response = request_with_retry(
-            scraper,
-            "post",
-            "https://search.technews24.site/blog.php",
-            data={"FU": FU, "FN": FN},
-            headers={"Referer": url},
-        )
-        soup = BeautifulSoup(response.text, "html.parser")
-        fu2_input = soup.find("input", {"type": "hidden", "name": "FU2"})
-        if not fu2_input:
-            logging.error(
-                "Step 2 Failed: Could not find FU2 input in blog.php response"
+        with hop_span("download_links", "movie_page", _host(url)) as span:
+            response = await async_request_with_retry(scraper, "get", url)
+            if not response:
+                logging.error(f"Failed to load initial URL: {url}")
+                span.fail("request")
+                return []
+            inputs = await _parse(hidden_inputs, response, ("FU", "FN"))
+            if "FU" not in inputs or "FN" not in inputs:
+                logging.error("Could not find FU or FN inputs on initial page")
+                span.fail("parse")
+                return []
+            FU = inputs["FU"]
+            FN = inputs["FN"]
+            logging.info("Step 1: Found FU and FN inputs")
+        blog_url = f"{ENDPOINTS.url('technews')}/blog.php"
+        with hop_span("download_links", "blog_php", _host(blog_url)) as span:
+            response = await async_request_with_retry(
+                scraper,
+                "post",
+                blog_url,
+                data={"FU": FU, "FN": FN},
+                headers={"Referer": url},
             )
-            return []
-        FU2 = fu2_input["value"]
-        logging.info("Step 2: Found FU2 input")
-        response = request_with_retry(
-            scraper,
-            "post",
-            "https://freethemesy.com/dld.php",
-            data={"FU2": FU2},
-            headers={"Referer": "https://search.technews24.site/"},
-        )
-        ss_match = re.search("var sss = '(.*?)'; var", response.text)
-        fetch_match = re.search("_0x12fb2a=(.*?);_0x3073", response.text)
-        if not fetch_match:
-            logging.info("Specific regex failed, trying generic pattern for JS array")
-            fetch_match = re.search(
-                "var\\s+(_0x[a-f0-9]+)\\s*=\\s*(\\[.*?\\]);", response.text
+            if not response:
+                span.fail("request")
+                return []
+            FU2 = (await _parse(hidden_inputs, response, ("FU2",))).get("FU2")
+            if FU2 is None:
+                logging.error(
+                    "Step 2 Failed: Could not find FU2 input in blog.php response"
+                )
+                span.fail("parse")
+                return []
+            logging.info("Step 2: Found FU2 input")
+        freethemesy_url = ENDPOINTS.url("freethemesy")
+        dld_url = f"{freethemesy_url}/dld.php"
+        with hop_span("download_links", "dld_php", _host(dld_url)) as span:
+            response = await async_request_with_retry(
+                scraper,
+                "post",
+                dld_url,
+                data={"FU2": FU2},
+                headers={"Referer": f"{ENDPOINTS.url('technews')}/"},
             )
-            if fetch_match:
-                fetch_str_list = fetch_match.group(2)
-            else:
-                fetch_str_list = None
-        else:
-            fetch_str_list = fetch_match.group(1)
-        if not ss_match or not fetch_str_list:
-            logging.error(
-                "Step 3 Failed: Could not find JS variables sss or array in dld.php response"
+            if not response:
+                span.fail("request")
+                return []
+            ss_match = DLD_SSS.search(response.text)
+            v = string_array_item(response.text, 18, "_0x12fb2a")
+            if v is None:
+                logging.info(
+                    "Specific array not found, trying generic pattern for JS array"
+                )
+                v = string_array_item(response.text, 18)
+            if not ss_match or v is None:
+                logging.error(
+                    "Step 3 Failed: Could not find JS variables sss or array in dld.php response"
+                )
+                logging.debug(f"Response snippet: {response.text[:500]}")
+                span.fail("parse")
+                return []
+            ss = ss_match.group(1)
+            logging.info("Step 3: Extracted sss and v variables")
+        final_url = f"{freethemesy_url}/new/l/api/m"
+        with hop_span("download_links", "api_m", _host(final_url)) as span:
+            payload = {"s": ss, "v": v}
+            headers = {
+                "Referer": dld_url,
+                "Origin": freethemesy_url,
+                "X-Requested-With": "XMLHttpRequest",
+                "Content-Type": "application/x-www-form-urlencoded",
+            }
+            final_response_obj = await async_request_with_retry(
+                scraper, "post", final_url, data=payload, headers=headers
             )
-            logging.debug(f"Response snippet: {response.text[:500]}")
-            return []
-        ss = ss_match.group(1)
-        try:
-            fetch_str_list = ast.literal_eval(fetch_str_list)
-            v = fetch_str_list[18]
-        except Exception as ast_err:
-            logging.exception(f"Step 3 Failed: AST parsing error: {ast_err}")
-            return []
-        logging.info("Step 3: Extracted sss and v variables")
-        final_url = "https://freethemesy.com/new/l/api/m"
-        payload = {"s": ss, "v": v}
-        headers = {
-            "Referer": "https://freethemesy.com/dld.php",
-            "Origin": "https://freethemesy.com",
-            "X-Requested-With": "XMLHttpRequest",
-            "Content-Type": "application/x-www-form-urlencoded",
-        }
-        final_response_obj = request_with_retry(
-            scraper, "post", final_url, data=payload, headers=headers
-        )
-        final_response_down_page = final_response_obj.text.strip()
-        if not final_response_down_page.startswith("http"):
-            logging.error(
-                f"Step 4 Failed: API returned non-URL: {final_response_down_page[:100]}"
+            if not final_response_obj:
+                span.fail("request")
+                return []
+            final_response_down_page = final_response_obj.text.strip()
+            if not final_response_down_page.startswith("http"):
+                logging.error(
+                    f"Step 4 Failed: API returned non-URL: {final_response_down_page[:100]}"
+                )
+                span.fail("parse")
+                return []
+            logging.info(
+                f"Step 4: Received final download page URL: {final_response_down_page}"
+            )
+        with hop_span(
+            "download_links", "final_page", _host(final_response_down_page)
+        ) as span:
+            response = await async_request_with_retry(
+                scraper, "get", final_response_down_page
+            )
+            if not response:
+                span.fail("request")
+                return []
+            rows = await _parse(link_rows, response)
+        links = [LinkGroup.from_row(row) for row in rows]
+        logging.info(f"Step 5: Extracted {len(links)} link groups")
+        if not links:
+            HOP_ERRORS.inc(
+                chain="download_links",
+                step="final_page",
+                host=_host(final_response_down_page),
+                reason="empty",
             )
-            return []
-        logging.info(
-            f"Step 4: Received final download page URL: {final_response_down_page}"
-        )
-        response = request_with_retry(scraper, "get", final_response_down_page)
-        soup = BeautifulSoup(response.text, "html.parser")
-        links = extract_all_links(soup)
-        logging.info(
-            f"Step 5: Extracted {(len(links) if isinstance(links, list) else 0)} raw link groups"
-        )
-        if isinstance(links, list):
-            filtered_links = []
-            for item in links:
-                if isinstance(item, dict) and "links" in item:
-                    item["links"] = [
-                        l for l in item["links"] if ".me" not in l.get("url", "")
-                    ]
-                    if item["links"]:
-                        filtered_links.append(item)
-                elif isinstance(item, dict) and "link" in item:
-                    if ".me" not in item["link"]:
-                        filtered_links.append(item)
-                elif isinstance(item, dict) and "url" in item:
-                    if ".me" not in item["url"]:
-                        filtered_links.append(item)
-            links = filtered_links
-        logging.info(f"Final: Returning {len(links)} filtered link groups")
         return links
     except Exception as e:
         logging.exception(f"CRITICAL Error extracting download links: {e}")
@@ -323,51 +792,97 @@ def get_download_links(url):
 
 
 def get_main_link_(url):
-    scraper = get_scraper()
+    return run_sync(async_get_main_link(url))
+
+
+async def async_get_main_link(url):
+    return await MAIN_LINK_FLIGHT.do(url, lambda: _fetch_main_link(url))
+
+
+async def async_iter_main_links(urls, concurrency=4):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(url):
+        async with semaphore:
+            return url, await async_get_main_link(url)
+
+    tasks = [asyncio.ensure_future(resolve(url)) for url in dict.fromkeys(urls)]
     try:
-        response = request_with_retry(scraper, "get", url)
-        soup = BeautifulSoup(response.text, "html.parser")
-        fu5_input = soup.find("input", {"type": "hidden", "name": "FU5"})
-        if not fu5_input:
-            return "Error: FU5 not found"
-        FU5 = fu5_input["value"]
-        response = request_with_retry(
-            scraper,
-            "post",
-            "https://sharelink-3.site/dld.php",
-            data={"FU5": FU5},
-            headers={"Referer": url},
-        )
-        soup = BeautifulSoup(response.text, "html.parser")
-        fu7_input = soup.find("input", {"type": "hidden", "name": "FU7"})
-        if not fu7_input:
-            return "Error: FU7 not found"
-        FU7 = fu7_input["value"]
-        response = request_with_retry(
-            scraper,
-            "post",
-            "https://sharelink-3.site/blog/",
-            data={"FU7": FU7},
-            headers={"Referer": "https://sharelink-3.site/dld.php"},
-        )
-        sss_match = re.search("var sss = '(.*?)';", response.text)
-        v_match = re.search("v: '(.*?)'", response.text)
-        if not sss_match or not v_match:
-            return "Error: sss or v not found in JS"
-        sss = sss_match.group(1)
-        __v = v_match.group(1)
-        url_api = "https://sharelink-3.site/l/api/m"
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "X-Requested-With": "XMLHttpRequest",
-            "Referer": "https://sharelink-3.site/blog/",
-        }
-        payload = {"s": sss, "v": __v}
-        response = request_with_retry(
-            scraper, "post", url_api, headers=headers, json=payload
-        )
-        return response.text
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _fetch_main_link(url):
+    with SESSION_POOL.session() as scraper:
+        return await _get_main_link(scraper, url)
+
+
+async def _get_main_link(scraper, url):
+    try:
+        with hop_span("main_link", "share_page", _host(url)) as span:
+            response = await async_request_with_retry(scraper, "get", url)
+            if not response:
+                span.fail("request")
+                return "Error: share page request failed"
+            FU5 = (await _parse(hidden_inputs, response, ("FU5",))).get("FU5")
+            if FU5 is None:
+                span.fail("parse")
+                return "Error: FU5 not found"
+        sharelink_url = ENDPOINTS.url("sharelink")
+        dld_url = f"{sharelink_url}/dld.php"
+        with hop_span("main_link", "dld_php", _host(dld_url)) as span:
+            response = await async_request_with_retry(
+                scraper,
+                "post",
+                dld_url,
+                data={"FU5": FU5},
+                headers={"Referer": url},
+            )
+            if not response:
+                span.fail("request")
+                return "Error: dld.php request failed"
+            FU7 = (await _parse(hidden_inputs, response, ("FU7",))).get("FU7")
+            if FU7 is None:
+                span.fail("parse")
+                return "Error: FU7 not found"
+        blog_url = f"{sharelink_url}/blog/"
+        with hop_span("main_link", "blog", _host(blog_url)) as span:
+            response = await async_request_with_retry(
+                scraper,
+                "post",
+                blog_url,
+                data={"FU7": FU7},
+                headers={"Referer": dld_url},
+            )
+            if not response:
+                span.fail("request")
+                return "Error: blog request failed"
+            sss_match = BLOG_SSS.search(response.text)
+            v_match = BLOG_V.search(response.text)
+            if not sss_match or not v_match:
+                span.fail("parse")
+                return "Error: sss or v not found in JS"
+            sss = sss_match.group(1)
+            __v = v_match.group(1)
+        url_api = f"{sharelink_url}/l/api/m"
+        with hop_span("main_link", "api_m", _host(url_api)) as span:
+            headers = {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": blog_url,
+            }
+            payload = {"s": sss, "v": __v}
+            response = await async_request_with_retry(
+                scraper, "post", url_api, headers=headers, json=payload
+            )
+            if not response:
+                span.fail("request")
+                return "Error: link API request failed"
+            return response.text
     except Exception as e:
         logging.exception(f"Error getting main link: {e}")
-        return f"Error getting main link: {str(e)}"
\ No newline at end of file
+        return f"Error getting main link: {str(e)}"
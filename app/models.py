@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class MovieSummary:
+    title: str
+    image: str
+    link: str
+
+
+@dataclass(slots=True)
+class DownloadLink:
+    label: str
+    url: str
+    info: str
+
+
+@dataclass(slots=True)
+class LinkGroup:
+    title: str
+    links: list[DownloadLink]
+
+    def to_row(self):
+        # Positional rows keep LINK_CACHE payloads free of repeated key names.
+        return [self.title, [[link.label, link.url, link.info] for link in self.links]]
+
+    @classmethod
+    def from_row(cls, row):
+        title, links = row
+        return cls(
+            title, [DownloadLink(label, url, info) for label, url, info in links]
+        )
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from bs4 import BeautifulSoup, SoupStrainer
+from app.link_parser import extract_all_links, keep_download_link
+from app.listing_parser import parse_listing
+
+_INPUTS = SoupStrainer("input")
+
+# Worker-side parsers: raw response bytes in, plain tuples and lists out, so
+# only compact results cross the process boundary. This module must not
+# import app.mlwbd, which spawned workers would otherwise load as well.
+
+
+def _decode(content, encoding):
+    if isinstance(content, str):
+        return content
+    return content.decode(encoding or "utf-8", errors="replace")
+
+
+def listing_rows(content, encoding=None, strip_alt=True):
+    return [
+        (movie.title, movie.image, movie.link)
+        for movie in parse_listing(_decode(content, encoding), strip_alt)
+    ]
+
+
+def hidden_inputs(content, encoding, names):
+    soup = BeautifulSoup(_decode(content, encoding), "html.parser", parse_only=_INPUTS)
+    found = {}
+    for tag in soup.find_all("input", {"type": "hidden"}):
+        name = tag.get("name")
+        if name in names and name not in found and tag.get("value") is not None:
+            found[name] = tag["value"]
+    return found
+
+
+def link_rows(content, encoding=None):
+    soup = BeautifulSoup(_decode(content, encoding), "html.parser")
+    return [group.to_row() for group in extract_all_links(soup, keep_download_link)]
+
+
+def _warm_worker():
+    # Pay the parser imports and first-call setup before real pages arrive.
+    listing_rows(b"<article><div class='title'><a href='/'>x</a></div></article>")
+    link_rows(b"<h2>Episode 1</h2><ul><li>a: <a href='/'>b</a></li></ul>")
+
+
+class ParsePool:
+    def __init__(self, workers=0):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self.offloaded = 0
+        self.inline = 0
+        self.restarts = 0
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # The parent runs worker threads and a background loop, so
+                # forking it is unsafe; spawned workers start clean.
+                self._executor = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+            return self._executor
+
+    def start(self):
+        if not self.workers:
+            return
+        pool = self._pool()
+        for _ in range(self.workers):
+            pool.submit(_warm_worker)
+
+    async def run(self, fn, *args):
+        if not self.workers:
+            self.inline += 1
+            return await asyncio.to_thread(fn, *args)
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._pool(), fn, *args)
+        except BrokenProcessPool:
+            logging.warning("Parse pool broke; restarting it and parsing inline")
+            self.shutdown()
+            self.restarts += 1
+            self.inline += 1
+            return await asyncio.to_thread(fn, *args)
+        self.offloaded += 1
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "offloaded": self.offloaded,
+            "inline": self.inline,
+            "restarts": self.restarts,
+        }
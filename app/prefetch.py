@@ -0,0 +1,58 @@
+import asyncio
+import logging
+
+
+class PagePrefetcher:
+    def __init__(self, fetch_page, cache, depth=1, max_page=50, max_inflight=2):
+        self._fetch_page = fetch_page
+        self._cache = cache
+        self.depth = depth
+        self.max_page = max_page
+        self.max_inflight = max_inflight
+        self._inflight = {}
+        self.scheduled = 0
+        self.completed = 0
+        self.failed = 0
+
+    def schedule(self, page):
+        loop = asyncio.get_running_loop()
+        for next_page in range(page + 1, page + 1 + self.depth):
+            if next_page > self.max_page or len(self._inflight) >= self.max_inflight:
+                break
+            if next_page in self._inflight or self._cache.is_fresh(next_page):
+                continue
+            task = loop.create_task(self._prefetch(next_page))
+            self._inflight[next_page] = task
+            self.scheduled += 1
+
+    async def wait(self, page):
+        task = self._inflight.get(page)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            pass
+
+    async def _prefetch(self, page):
+        try:
+            logging.info(f"Prefetching latest movies page {page}")
+            results = await self._fetch_page(page)
+            if results:
+                self._cache.set(page, results)
+                self.completed += 1
+            else:
+                self.failed += 1
+        except Exception as e:
+            self.failed += 1
+            logging.warning(f"Prefetch of page {page} failed: {e}")
+        finally:
+            self._inflight.pop(page, None)
+
+    def stats(self):
+        return {
+            "inflight": len(self._inflight),
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
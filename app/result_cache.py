@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+
+def _is_cacheable(value):
+    return bool(value)
+
+
+class TTLCache:
+    def __init__(self, ttl=300, max_entries=256, stale_ttl=1800, cacheable=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._cacheable = cacheable or _is_cacheable
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._tasks = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            value, stored_at = entry
+            age = now - stored_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, True
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return value, False
+            del self._entries[key]
+            self.misses += 1
+            return None, None
+
+    def get(self, key):
+        value, _ = self._lookup(key)
+        return value
+
+    def is_fresh(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry[1] < self.ttl
+
+    def set(self, key, value):
+        if not self._cacheable(value):
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    async def get_or_load(self, key, loader):
+        value, fresh = self._lookup(key)
+        if value is not None:
+            if not fresh:
+                self._schedule_refresh(key, loader)
+            return value
+        value = await loader()
+        self.set(key, value)
+        return value
+
+    def _schedule_refresh(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        task = asyncio.get_running_loop().create_task(self._refresh(key, loader))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key, loader):
+        try:
+            self.set(key, await loader())
+        except Exception as e:
+            logging.warning(f"Background refresh failed for {key!r}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "size": size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+from cloudscraper.exceptions import CloudflareException
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504, 520, 521, 522, 523, 524}
+
+
+def is_retryable(error):
+    if isinstance(error, (Timeout, ConnectionError, CloudflareException)):
+        return True
+    if isinstance(error, HTTPError):
+        response = error.response
+        return response is None or response.status_code in RETRYABLE_STATUS
+    return False
+
+
+def is_host_failure(error):
+    # A 403/404 still proves the host is up; only outages should trip breakers.
+    return is_retryable(error) and not isinstance(error, CloudflareException)
+
+
+def is_session_failure(error):
+    # Only a broken connection or an unsolved challenge says anything about
+    # the session itself; HTTP errors leave its cookies worth keeping.
+    return isinstance(error, (Timeout, ConnectionError, CloudflareException))
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts=4,
+        deadline=60,
+        attempt_timeout=20,
+        base_delay=0.5,
+        max_delay=8,
+    ):
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def next_delay(self, previous):
+        # Decorrelated jitter: spread retries out instead of synchronising them.
+        return min(self.max_delay, random.uniform(self.base_delay, previous * 3))
+
+    def is_retryable(self, error):
+        return is_retryable(error)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, recovery_time=30):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self.opened_at >= self.recovery_time:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            # A probe that never reported back expires, so a lost outcome
+            # cannot leave the host half-open for good.
+            if self.state == self.HALF_OPEN and (
+                not self._probing or now - self._probe_started >= self.recovery_time
+            ):
+                self._probing = True
+                self._probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def abandon(self):
+        # The allowed request ended without an outcome (cancelled, or out of
+        # time before it was sent); let the next caller probe instead.
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    def __init__(self, failure_threshold=5, recovery_time=30):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, host):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    self.failure_threshold, self.recovery_time
+                )
+            return breaker
+
+    def reset(self):
+        with self._lock:
+            self._breakers.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                host: {
+                    "state": breaker.state,
+                    "failures": breaker.failures,
+                    "rejected": breaker.rejected,
+                }
+                for host, breaker in self._breakers.items()
+            }
@@ -0,0 +1,161 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Set around prefetch, crawl and other work nobody is waiting on; asyncio
+# tasks inherit it, so it follows the fetch down to every request it makes.
+PRIORITY = contextvars.ContextVar("request_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority):
+    token = PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        PRIORITY.reset(token)
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "granted", "cancelled")
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+        self.cancelled = False
+
+
+class _HostState:
+    def __init__(self, rate, burst, concurrency):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.inflight = 0
+        self.queue = []
+        self.granted = 0
+        self.waited = 0
+
+
+class RequestScheduler:
+    def __init__(self, rates=None, rate=None, burst=1, concurrency=None):
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self.configure(rates or {}, rate, burst, concurrency)
+
+    def configure(self, rates, rate=None, burst=1, concurrency=None):
+        with self._lock:
+            self.rates = dict(rates)
+            self.rate = rate
+            self.burst = max(1, burst)
+            self.concurrency = concurrency
+            self._hosts = {}
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            rate = self.rates.get(host, self.rate)
+            state = self._hosts[host] = _HostState(rate, self.burst, self.concurrency)
+        return state
+
+    def _dispatch(self, state):
+        # Grant queued requests in priority order while the host has both a
+        # token and a free concurrency slot. Returns how long until the next
+        # token when that is what holds the queue back.
+        if state.rate:
+            now = time.monotonic()
+            state.tokens = min(
+                state.burst, state.tokens + (now - state.updated_at) * state.rate
+            )
+            state.updated_at = now
+        while state.queue:
+            waiter = state.queue[0][2]
+            if waiter.cancelled:
+                heapq.heappop(state.queue)
+                continue
+            if state.concurrency and state.inflight >= state.concurrency:
+                return None
+            if state.rate:
+                if state.tokens < 1:
+                    return (1 - state.tokens) / state.rate
+                state.tokens -= 1
+            heapq.heappop(state.queue)
+            state.inflight += 1
+            state.granted += 1
+            waiter.granted = True
+            waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+        return None
+
+    async def acquire(self, host, priority=None):
+        priority = PRIORITY.get() if priority is None else priority
+        waiter = _Waiter(asyncio.get_running_loop())
+        queued_at = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            heapq.heappush(state.queue, (priority, next(self._seq), waiter))
+            delay = self._dispatch(state)
+        try:
+            while not waiter.granted:
+                # Waiters wake themselves to refill the bucket, at the latest
+                # once per token interval; release() wakes slot-bound ones.
+                if delay is None and state.rate:
+                    delay = 1 / state.rate
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), delay)
+                except TimeoutError:
+                    with self._lock:
+                        delay = self._dispatch(state)
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release(state)
+                else:
+                    waiter.cancelled = True
+            raise
+        waited = time.monotonic() - queued_at
+        if waited > 0.001:
+            state.waited += 1
+        return state, waited
+
+    def _release(self, state):
+        state.inflight -= 1
+        self._dispatch(state)
+
+    def release(self, state):
+        with self._lock:
+            self._release(state)
+
+    @asynccontextmanager
+    async def slot(self, host, priority=None):
+        state, waited = await self.acquire(host, priority)
+        try:
+            yield waited
+        finally:
+            self.release(state)
+
+    def stats(self):
+        with self._lock:
+            return {
+                host: {
+                    "queued": sum(not item[2].cancelled for item in state.queue),
+                    "inflight": state.inflight,
+                    "granted": state.granted,
+                    "waited": state.waited,
+                }
+                for host, state in self._hosts.items()
+            }
@@ -0,0 +1,85 @@
+import os
+
+
+def _mirrors(name, default):
+    # MLWBD_<NAME>_URLS lists mirrors comma-separated, preferred first, with
+    # "a|b" for mirrors of equal preference (the faster one leads); the
+    # single-url MLWBD_<NAME>_URL setting is still honoured.
+    value = (
+        os.environ.get(f"MLWBD_{name}_URLS")
+        or os.environ.get(f"MLWBD_{name}_URL")
+        or default
+    )
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+UPSTREAM_MIRRORS = {
+    "fojik": _mirrors("FOJIK", "https://fojik.site"),
+    "technews": _mirrors("TECHNEWS", "https://search.technews24.site"),
+    "freethemesy": _mirrors("FREETHEMESY", "https://freethemesy.com"),
+    "sharelink": _mirrors("SHARELINK", "https://sharelink-3.site"),
+}
+# Domains a role has moved off: links to them are still accepted and are
+# fetched from the current mirrors instead.
+UPSTREAM_ALIASES = {
+    "fojik": _mirrors("FOJIK_LEGACY", "https://fojik.com"),
+}
+ENDPOINT_PROBE = os.environ.get("MLWBD_ENDPOINT_PROBE", "1") == "1"
+ENDPOINT_PROBE_INTERVAL = float(os.environ.get("MLWBD_ENDPOINT_PROBE_INTERVAL", "120"))
+ENDPOINT_PROBE_TIMEOUT = float(os.environ.get("MLWBD_ENDPOINT_PROBE_TIMEOUT", "10"))
+ENDPOINT_FAILURE_THRESHOLD = int(os.environ.get("MLWBD_ENDPOINT_FAILURES", "3"))
+ENDPOINT_RECOVERY_TIME = float(os.environ.get("MLWBD_ENDPOINT_RECOVERY", "300"))
+
+SEARCH_CACHE_TTL = float(os.environ.get("MLWBD_SEARCH_CACHE_TTL", "300"))
+SEARCH_CACHE_SIZE = int(os.environ.get("MLWBD_SEARCH_CACHE_SIZE", "512"))
+LATEST_CACHE_TTL = float(os.environ.get("MLWBD_LATEST_CACHE_TTL", "120"))
+LATEST_CACHE_SIZE = int(os.environ.get("MLWBD_LATEST_CACHE_SIZE", "64"))
+CACHE_STALE_TTL = float(os.environ.get("MLWBD_CACHE_STALE_TTL", "1800"))
+CLEARANCE_PATH = os.environ.get("MLWBD_CLEARANCE_PATH", ".cache/clearance.sqlite3")
+CLEARANCE_TTL = float(os.environ.get("MLWBD_CLEARANCE_TTL", "1800"))
+CLEARANCE_LEASE = float(os.environ.get("MLWBD_CLEARANCE_LEASE", "30"))
+PARSE_WORKERS = int(
+    os.environ.get("MLWBD_PARSE_WORKERS", str(min(4, (os.cpu_count() or 1) - 1)))
+)
+CONDITIONAL_CACHE_SIZE = int(os.environ.get("MLWBD_CONDITIONAL_CACHE_SIZE", "256"))
+LINK_CACHE_PATH = os.environ.get("MLWBD_LINK_CACHE_PATH", ".cache/links.sqlite3")
+LINK_CACHE_TTL = float(os.environ.get("MLWBD_LINK_CACHE_TTL", "21600"))
+LINK_CACHE_PURGE_INTERVAL = float(
+    os.environ.get("MLWBD_LINK_CACHE_PURGE_INTERVAL", "600")
+)
+PREFETCH_DEPTH = int(os.environ.get("MLWBD_PREFETCH_DEPTH", "1"))
+PREFETCH_MAX_PAGE = int(os.environ.get("MLWBD_PREFETCH_MAX_PAGE", "50"))
+PREFETCH_MAX_INFLIGHT = int(os.environ.get("MLWBD_PREFETCH_MAX_INFLIGHT", "2"))
+RETRY_MAX_ATTEMPTS = int(os.environ.get("MLWBD_RETRY_MAX_ATTEMPTS", "4"))
+RETRY_DEADLINE = float(os.environ.get("MLWBD_RETRY_DEADLINE", "60"))
+RETRY_ATTEMPT_TIMEOUT = float(os.environ.get("MLWBD_RETRY_ATTEMPT_TIMEOUT", "20"))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("MLWBD_BREAKER_FAILURES", "5"))
+BREAKER_RECOVERY_TIME = float(os.environ.get("MLWBD_BREAKER_RECOVERY", "30"))
+# Per-host request scheduler: token-bucket rate and burst, plus a cap on
+# requests in flight. A rate of 0 disables the bucket.
+HOST_RATE = float(os.environ.get("MLWBD_HOST_RATE", "8"))
+HOST_BURST = int(os.environ.get("MLWBD_HOST_BURST", "16"))
+HOST_CONCURRENCY = int(os.environ.get("MLWBD_HOST_CONCURRENCY", "6"))
+# Threads for blocking upstream calls, kept apart from the default executor
+# that serves cache and catalog lookups. Enough for every upstream role to
+# use its full concurrency cap at once.
+HTTP_WORKERS = int(
+    os.environ.get("MLWBD_HTTP_WORKERS", str(max(16, HOST_CONCURRENCY * 5)))
+)
+RESOLVE_CONCURRENCY = int(os.environ.get("MLWBD_RESOLVE_CONCURRENCY", "4"))
+TITLE_INDEX_SIZE = int(os.environ.get("MLWBD_TITLE_INDEX_SIZE", "50000"))
+FEED_WINDOW_PAGES = int(os.environ.get("MLWBD_FEED_WINDOW_PAGES", "3"))
+CATALOG_PATH = os.environ.get("MLWBD_CATALOG_PATH", ".cache/catalog.sqlite3")
+CATALOG_STALE_TTL = float(os.environ.get("MLWBD_CATALOG_STALE_TTL", "3600"))
+CATALOG_CRAWL = os.environ.get("MLWBD_CATALOG_CRAWL", "0") == "1"
+CATALOG_PAGE_INTERVAL = float(os.environ.get("MLWBD_CATALOG_PAGE_INTERVAL", "2"))
+CATALOG_CYCLE_INTERVAL = float(os.environ.get("MLWBD_CATALOG_CYCLE_INTERVAL", "600"))
+CATALOG_PAGES_PER_CYCLE = int(os.environ.get("MLWBD_CATALOG_PAGES_PER_CYCLE", "20"))
+CATALOG_MAX_PAGES = int(os.environ.get("MLWBD_CATALOG_MAX_PAGES", "500"))
+IMAGE_CACHE_DIR = os.environ.get("MLWBD_IMAGE_CACHE_DIR", ".cache/thumbs")
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("MLWBD_IMAGE_CACHE_MAX_BYTES", "268435456"))
+IMAGE_THUMB_WIDTH = int(os.environ.get("MLWBD_IMAGE_THUMB_WIDTH", "342"))
+IMAGE_QUALITY = int(os.environ.get("MLWBD_IMAGE_QUALITY", "75"))
+IMAGE_MAX_SOURCE_BYTES = int(os.environ.get("MLWBD_IMAGE_MAX_SOURCE_BYTES", "8388608"))
+# Signs /img URLs; when unset, one is generated and kept in IMAGE_CACHE_DIR.
+IMAGE_SECRET = os.environ.get("MLWBD_IMAGE_SECRET", "")
@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+
+class _PooledSession:
+    __slots__ = ("session", "created_at", "uses", "failed")
+
+    def __init__(self, session):
+        self.session = session
+        self.created_at = time.monotonic()
+        self.uses = 0
+        self.failed = False
+
+
+class SessionPool:
+    def __init__(self, factory, max_size=8, max_age=900, max_uses=250):
+        self._factory = factory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self._idle = []
+        self._leased = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def _expired(self, entry, now):
+        return now - entry.created_at >= self.max_age or entry.uses >= self.max_uses
+
+    def _close(self, entry):
+        self.recycled += 1
+        try:
+            entry.session.close()
+        except Exception as e:
+            logging.warning(f"Error closing pooled session: {e}")
+
+    def acquire(self):
+        now = time.monotonic()
+        stale = []
+        entry = None
+        with self._lock:
+            while self._idle:
+                candidate = self._idle.pop()
+                if self._expired(candidate, now):
+                    stale.append(candidate)
+                    continue
+                entry = candidate
+                self.reused += 1
+                break
+        for old in stale:
+            self._close(old)
+        if entry is None:
+            entry = _PooledSession(self._factory())
+            with self._lock:
+                self.created += 1
+        entry.uses += 1
+        with self._lock:
+            self._leased[id(entry.session)] = entry
+        return entry.session
+
+    def mark_failed(self, session):
+        with self._lock:
+            entry = self._leased.get(id(session))
+            if entry is not None:
+                entry.failed = True
+
+    def release(self, session, failed=False):
+        with self._lock:
+            entry = self._leased.pop(id(session), None)
+            if entry is None:
+                return
+            keep = (
+                not (failed or entry.failed)
+                and not self._expired(entry, time.monotonic())
+                and len(self._idle) < self.max_size
+            )
+            if keep:
+                self._idle.append(entry)
+        if not keep:
+            if failed or entry.failed:
+                logging.info("Recycling scraper session after failure")
+            self._close(entry)
+
+    @contextmanager
+    def session(self):
+        session = self.acquire()
+        failed = False
+        try:
+            yield session
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.release(session, failed=failed)
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._close(entry)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "created": self.created,
+                "reused": self.reused,
+                "recycled": self.recycled,
+            }
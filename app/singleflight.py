@@ -0,0 +1,65 @@
+import asyncio
+import concurrent.futures
+import threading
+
+
+class SingleFlight:
+    def __init__(self):
+        # concurrent.futures.Future can be awaited from any event loop, so
+        # callers on the Reflex loop and the sync wrapper loop share flights.
+        self._calls = {}
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._calls[key] = concurrent.futures.Future()
+            self.executions += 1
+            return future, True
+
+    def _spawn(self, key, future, work):
+        # The work runs in its own task rather than in the leader's, so a
+        # leader that is cancelled or gives up does not take it down for the
+        # followers sharing the flight.
+        task = asyncio.get_running_loop().create_task(self._run(key, future, work))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key, future, work):
+        try:
+            result = await work()
+        except BaseException as e:
+            future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    @staticmethod
+    async def _wait(future):
+        # Shielded so a cancelled caller does not cancel the shared future.
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def do(self, key, fn):
+        future, leader = self._join(key)
+        if leader:
+            self._spawn(key, future, fn)
+        return await self._wait(future)
+
+    def stats(self):
+        with self._lock:
+            inflight = len(self._calls)
+        return {
+            "inflight": inflight,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
@@ -1,13 +1,20 @@
 import reflex as rx
 import logging
 from typing import TypedDict
-from app.mlwbd import get_download_links, get_main_link_
+from app import scraper_config
+from app.mlwbd import (
+    async_get_download_links,
+    async_get_main_link,
+    async_iter_main_links,
+)
 
 
 class DownloadLink(TypedDict):
     label: str
     url: str
     info: str
+    direct: str
+    status: str
 
 
 class DownloadGroup(TypedDict):
@@ -15,6 +22,22 @@ class DownloadGroup(TypedDict):
     links: list[DownloadLink]
 
 
+def _group_state(group):
+    return {
+        "title": group.title,
+        "links": [
+            {
+                "label": link.label,
+                "url": link.url,
+                "info": link.info,
+                "direct": "",
+                "status": "",
+            }
+            for link in group.links
+        ],
+    }
+
+
 class DetailsState(rx.State):
     movie_url: str = ""
     download_groups: list[DownloadGroup] = []
@@ -22,6 +45,9 @@ class DetailsState(rx.State):
     direct_link: str = ""
     selected_link_url: str = ""
     is_generating_direct: bool = False
+    is_resolving_all: bool = False
+    resolved_count: int = 0
+    resolve_total: int = 0
 
     @rx.event
     def on_load(self):
@@ -31,6 +57,9 @@ class DetailsState(rx.State):
         self.direct_link = ""
         self.selected_link_url = ""
         self.is_generating_direct = False
+        self.is_resolving_all = False
+        self.resolved_count = 0
+        self.resolve_total = 0
         if url:
             self.movie_url = url
             return DetailsState.fetch_links
@@ -52,46 +81,11 @@ class DetailsState(rx.State):
         yield
         try:
             logging.info(f"Fetching links for: {self.movie_url}")
-            raw_links = get_download_links(self.movie_url)
-            if not raw_links:
-                logging.warning(f"No raw links returned for {self.movie_url}")
-            normalized = []
-            standalone_links = []
-            for item in raw_links:
-                if "links" in item and isinstance(item["links"], list):
-                    group = {"title": item.get("title", "Download Links"), "links": []}
-                    for link in item["links"]:
-                        group["links"].append(
-                            {
-                                "label": link.get("label", "Link"),
-                                "url": link.get("url", ""),
-                                "info": link.get("type", ""),
-                            }
-                        )
-                    if group["links"]:
-                        normalized.append(group)
-                elif "link" in item:
-                    standalone_links.append(
-                        {
-                            "label": item.get("type", "Download"),
-                            "url": item.get("link", ""),
-                            "info": item.get("quality", ""),
-                        }
-                    )
-                elif "url" in item:
-                    standalone_links.append(
-                        {
-                            "label": item.get("label", "Download"),
-                            "url": item.get("url", ""),
-                            "info": item.get("type", ""),
-                        }
-                    )
-            if standalone_links:
-                normalized.append(
-                    {"title": "Download Options", "links": standalone_links}
-                )
+            groups = await async_get_download_links(self.movie_url)
+            normalized = [_group_state(group) for group in groups]
             self.download_groups = normalized
             if not normalized:
+                logging.warning(f"No raw links returned for {self.movie_url}")
                 yield rx.toast.error(
                     "No links found. The site might be blocking our request or the structure changed.",
                     duration=5000,
@@ -115,7 +109,7 @@ class DetailsState(rx.State):
         self.direct_link = ""
         yield
         try:
-            result = get_main_link_(url)
+            result = await async_get_main_link(url)
             if result and result.startswith("http") and ("Error" not in result):
                 self.direct_link = result
                 yield rx.toast.success("Link generated successfully!")
@@ -127,6 +121,63 @@ class DetailsState(rx.State):
         finally:
             self.is_generating_direct = False
 
+    @rx.event(background=True)
+    async def resolve_all_links(self):
+        # Runs in the background so Get Link and copy stay responsive while
+        # dozens of links resolve. Links are tracked by position because each
+        # `async with self` may load a fresh copy of the state.
+        async with self:
+            if self.is_resolving_all:
+                return
+            movie_url = self.movie_url
+            pending = {}
+            for gi, group in enumerate(self.download_groups):
+                for li, link in enumerate(group["links"]):
+                    if link["url"] and link["status"] != "done":
+                        link["status"] = "pending"
+                        pending.setdefault(link["url"], []).append((gi, li))
+            if pending:
+                self.is_resolving_all = True
+                self.resolved_count = 0
+                self.resolve_total = len(pending)
+        if not pending:
+            yield rx.toast.info("All links are already resolved.")
+            return
+        failed = 0
+        try:
+            async for url, result in async_iter_main_links(
+                list(pending), concurrency=scraper_config.RESOLVE_CONCURRENCY
+            ):
+                ok = result and result.startswith("http") and ("Error" not in result)
+                if not ok:
+                    failed += 1
+                async with self:
+                    if self.movie_url != movie_url:
+                        return
+                    for gi, li in pending[url]:
+                        link = self.download_groups[gi]["links"][li]
+                        link["direct"] = result if ok else ""
+                        link["status"] = "done" if ok else "error"
+                    self.resolved_count += 1
+            if failed:
+                yield rx.toast.warning(
+                    f"{failed} of {len(pending)} links could not be resolved."
+                )
+            else:
+                yield rx.toast.success("All links resolved!")
+        except Exception as e:
+            logging.exception(f"Error resolving all links: {e}")
+            yield rx.toast.error("An error occurred while resolving links.")
+        finally:
+            async with self:
+                if self.movie_url == movie_url:
+                    for positions in pending.values():
+                        for gi, li in positions:
+                            link = self.download_groups[gi]["links"][li]
+                            if link["status"] == "pending":
+                                link["status"] = ""
+                self.is_resolving_all = False
+
     @rx.event
     def copy_to_clipboard(self):
         yield rx.set_clipboard(self.direct_link)
@@ -1,6 +1,8 @@
 import reflex as rx
 import logging
-from app.mlwbd import search_movie, get_latest_movies
+from app import scraper_config
+from app.image_proxy import with_thumbnails
+from app.mlwbd import async_search_movie, async_get_latest_movies, is_movie_url
 
 
 class SearchState(rx.State):
@@ -10,10 +12,17 @@ class SearchState(rx.State):
     has_searched: bool = False
     latest_movies: list[dict[str, str]] = []
     page: int = 1
+    first_page: int = 1
+    page_sizes: list[int] = []
     is_loading_more: bool = False
+    is_loading_previous: bool = False
     has_more_movies: bool = True
     is_initial_loading: bool = False
 
+    @rx.var
+    def has_previous_movies(self) -> bool:
+        return self.first_page > 1
+
     @rx.event
     def on_load(self):
         if not self.latest_movies:
@@ -23,12 +32,15 @@ class SearchState(rx.State):
     async def load_latest_movies(self):
         self.is_initial_loading = True
         self.page = 1
+        self.first_page = 1
+        self.page_sizes = []
         self.latest_movies = []
         self.has_more_movies = True
         yield
         try:
-            movies = get_latest_movies(self.page)
+            movies = with_thumbnails(await async_get_latest_movies(self.page))
             self.latest_movies = movies
+            self.page_sizes = [len(movies)] if movies else []
             if not movies:
                 self.has_more_movies = False
         except Exception as e:
@@ -44,19 +56,56 @@ class SearchState(rx.State):
         self.is_loading_more = True
         yield
         try:
-            self.page += 1
-            new_movies = get_latest_movies(self.page)
+            next_page = self.page + 1
+            new_movies = with_thumbnails(await async_get_latest_movies(next_page))
             if new_movies:
-                self.latest_movies = self.latest_movies + new_movies
+                # Only a bounded window of pages lives in session state; pages
+                # scrolled past are dropped and come back from LATEST_CACHE.
+                movies = self.latest_movies + new_movies
+                sizes = self.page_sizes + [len(new_movies)]
+                while len(sizes) > scraper_config.FEED_WINDOW_PAGES:
+                    movies = movies[sizes[0] :]
+                    sizes = sizes[1:]
+                    self.first_page += 1
+                self.latest_movies = movies
+                self.page_sizes = sizes
+                self.page = next_page
             else:
                 self.has_more_movies = False
         except Exception as e:
             logging.exception(f"Error loading more movies: {e}")
-            self.page -= 1
             yield rx.toast.error("Failed to load more movies.")
         finally:
             self.is_loading_more = False
 
+    @rx.event
+    async def load_previous_movies(self):
+        if self.is_loading_previous or self.first_page <= 1:
+            return
+        self.is_loading_previous = True
+        yield
+        try:
+            previous_page = self.first_page - 1
+            new_movies = with_thumbnails(await async_get_latest_movies(previous_page))
+            if not new_movies:
+                yield rx.toast.error("Failed to load previous movies.")
+                return
+            movies = new_movies + self.latest_movies
+            sizes = [len(new_movies)] + self.page_sizes
+            while len(sizes) > scraper_config.FEED_WINDOW_PAGES:
+                movies = movies[: -sizes[-1]]
+                sizes = sizes[:-1]
+                self.page -= 1
+                self.has_more_movies = True
+            self.latest_movies = movies
+            self.page_sizes = sizes
+            self.first_page = previous_page
+        except Exception as e:
+            logging.exception(f"Error loading previous movies: {e}")
+            yield rx.toast.error("Failed to load previous movies.")
+        finally:
+            self.is_loading_previous = False
+
     @rx.event
     async def search_movie_event(self):
         query = self.search_query.strip()
@@ -65,9 +114,7 @@ class SearchState(rx.State):
                 "Please enter a search term", duration=3000, close_button=True
             )
             return
-        if (query.startswith("http://") or query.startswith("https://")) and (
-            "fojik.com" in query or "fojik.site" in query
-        ):
+        if query.startswith(("http://", "https://")) and is_movie_url(query):
             yield rx.toast.info(
                 "Direct link detected! Redirecting to details...",
                 duration=3000,
@@ -81,7 +128,7 @@ class SearchState(rx.State):
         yield
         try:
             logging.info(f"Frontend: Starting search for '{query}'")
-            results = search_movie(query)
+            results = with_thumbnails(await async_search_movie(query))
             self.search_results = results
             if not results:
                 yield rx.toast.info(
@@ -0,0 +1,72 @@
+import asyncio
+from app import mlwbd
+from app.catalog import Catalog, CatalogCrawler, fts_query
+from app.models import MovieSummary
+
+
+def test_upsert_counts_new_movies_and_search_matches_prefixes(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+    movies = [
+        MovieSummary("Avatar: The Way of Water (2022)", "a.jpg", "/a"),
+        MovieSummary("The Family Man Season 2", "f.jpg", "/f"),
+    ]
+    assert catalog.upsert(movies) == 2
+    assert catalog.upsert(movies) == 0
+    assert catalog.upsert([MovieSummary("Avatar 2 (2022)", "a.jpg", "/a")]) == 0
+    assert [movie.link for movie in catalog.search("fam man")] == ["/f"]
+    assert catalog.search("Avatar 2")[0].title == "Avatar 2 (2022)"
+    assert catalog.search("way of water") == []
+    assert fts_query('"; DROP -x*') == '"drop"* "x"*'
+
+
+def test_crawler_fills_catalog_and_search_skips_upstream(upstream, tmp_path):
+    crawler = CatalogCrawler(mlwbd.CATALOG, mlwbd._crawl_latest_movies, page_interval=0)
+    mlwbd.run_sync(crawler.crawl_cycle())
+    assert mlwbd.CATALOG.is_fresh()
+    assert mlwbd.CATALOG.get_state("backfill_page") == str(upstream.max_pages + 1)
+    title = mlwbd.get_latest_movies(1)[0].title
+    results = mlwbd.search_movie(title)
+    assert results and results[0].title == title
+    assert upstream.count("search") == 0
+
+
+def test_crawler_retries_a_failed_page_instead_of_finishing(upstream):
+    failing = {3}
+
+    async def fetch(page):
+        if page not in failing:
+            return await mlwbd._crawl_latest_movies(page)
+        failing.discard(page)
+        upstream.inject_failure("listing", status=503)
+        try:
+            return await mlwbd._crawl_latest_movies(page)
+        finally:
+            upstream.clear_failures()
+
+    crawler = CatalogCrawler(mlwbd.CATALOG, fetch, page_interval=0)
+    mlwbd.run_sync(crawler.crawl_cycle())
+    assert mlwbd.CATALOG.get_state("backfill_page") == "3"
+    assert not mlwbd.CATALOG.is_fresh()
+    mlwbd.run_sync(crawler.crawl_cycle())
+    assert mlwbd.CATALOG.get_state("backfill_page") == str(upstream.max_pages + 1)
+    assert mlwbd.CATALOG.is_fresh()
+
+
+def test_head_pass_is_not_fooled_by_searched_movies(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+
+    def movies(*numbers):
+        return [MovieSummary(f"Movie {n}", "", f"/m{n}") for n in numbers]
+
+    pages = {1: movies(10, 9, 8), 2: movies(7, 6, 5)}
+
+    async def fetch(page):
+        return pages.get(page, [])
+
+    crawler = CatalogCrawler(catalog, fetch, page_interval=0)
+    asyncio.run(crawler.crawl_cycle())
+    assert catalog.count() == 6 and catalog.is_fresh()
+    pages = {1: movies(15, 14, 13), 2: movies(12, 11, 10), 3: movies(9, 8, 7)}
+    catalog.upsert(movies(15, 14, 13))
+    asyncio.run(crawler.crawl_cycle())
+    assert catalog.count() == 11
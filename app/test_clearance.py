@@ -0,0 +1,73 @@
+import asyncio
+import time
+import requests
+from app import mlwbd
+from app.clearance import ClearanceStore, apply_clearance, session_clearance
+
+UA = "Mozilla/5.0 test"
+
+
+def test_clearance_shared_between_stores_until_expiry(tmp_path):
+    path = str(tmp_path / "clearance.db")
+    first, second = ClearanceStore(path), ClearanceStore(path)
+    session = requests.Session()
+    session.cookies.set("cf_clearance", "token", domain=".fojik.site", path="/")
+    session.cookies.set("theme", "dark", domain="fojik.site", path="/")
+    rows = session_clearance(session, "fojik.site")
+    assert [row[0] for row in rows] == ["cf_clearance"]
+    first.put("fojik.site", UA, rows)
+    assert second.get("fojik.site", "other agent") is None
+    fresh = requests.Session()
+    apply_clearance(fresh, second.get("fojik.site", UA))
+    assert fresh.cookies.get("cf_clearance", domain=".fojik.site") == "token"
+    expiring = [["cf_clearance", "old", ".a.example", "/", int(time.time()) + 30]]
+    first.put("a.example", UA, expiring)
+    assert second.get("a.example", UA) is None
+
+
+def test_refresh_lease_is_exclusive_across_processes(tmp_path):
+    path = str(tmp_path / "clearance.db")
+    first, second = ClearanceStore(path), ClearanceStore(path, lease_ttl=0)
+    owner = first.acquire("fojik.site", UA)
+    assert owner and second.acquire("fojik.site", UA) is None
+    first.release("fojik.site", UA, owner)
+    taken = second.acquire("fojik.site", UA)
+    assert taken
+    # second's zero-length lease has already expired, so first can take over.
+    assert first.acquire("fojik.site", UA)
+
+
+def test_not_found_answer_lets_waiters_skip_the_lease(upstream):
+    upstream.route_latency["listing"] = 0.3
+    url = f"{mlwbd.ENDPOINTS.url('fojik')}/page/{upstream.max_pages + 1}/"
+
+    async def scenario():
+        with mlwbd.SESSION_POOL.session() as scraper:
+            return await asyncio.gather(
+                *[mlwbd.async_request_with_retry(scraper, "get", url) for _ in range(5)]
+            ), scraper.headers.get("User-Agent", "")
+
+    started = time.monotonic()
+    responses, user_agent = mlwbd.run_sync(scenario())
+    assert responses == [None] * 5
+    # One lease holder, then the other four together; not five in a row.
+    assert time.monotonic() - started < 1.2
+    assert mlwbd.CLEARANCE.get("127.0.0.1", user_agent) == []
+
+
+def test_waiters_do_not_queue_behind_a_failed_lease_holder(upstream):
+    async def scenario():
+        with mlwbd.SESSION_POOL.session() as scraper:
+            user_agent = scraper.headers.get("User-Agent", "")
+            lease = mlwbd.CLEARANCE.acquire("127.0.0.1", user_agent)
+            waiters = [
+                asyncio.ensure_future(mlwbd._adopt_clearance(scraper, "127.0.0.1"))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0.15)
+            mlwbd.CLEARANCE.release("127.0.0.1", user_agent, lease)
+            return await asyncio.gather(*waiters), user_agent
+
+    leases, user_agent = mlwbd.run_sync(scenario())
+    assert leases == [None] * 3
+    assert mlwbd.CLEARANCE.acquire("127.0.0.1", user_agent)
@@ -0,0 +1,46 @@
+import json
+from app import cli, mlwbd
+
+
+def test_batch_cli_streams_jsonl_and_resumes(upstream, tmp_path, capsys):
+    movie_url = f"{upstream.base_url}/fojik/the-family-man-season-2/"
+    inputs = tmp_path / "inputs.txt"
+    inputs.write_text(f"{movie_url}\n# comment\navatar\n{movie_url}\n")
+    output = tmp_path / "out.jsonl"
+    checkpoint = tmp_path / "done.txt"
+    argv = [str(inputs), "-o", str(output), "--checkpoint", str(checkpoint)]
+    argv += ["--default-rate", "0", "--host-concurrency", "0"]
+    assert cli.main(argv) == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {record["input"] for record in records} == {movie_url, "avatar"}
+    assert all(record["ok"] for record in records)
+    links = [link for group in records[0]["groups"] for link in group["links"]]
+    assert links and all(link["direct"].endswith(".mkv") for link in links)
+    assert "2 done, 0 failed, 0 skipped" in capsys.readouterr().err
+    assert cli.main(argv) == 0
+    assert len(output.read_text().splitlines()) == 2
+    assert "0 done, 0 failed, 2 skipped" in capsys.readouterr().err
+
+
+def test_rate_specs_expand_roles_to_every_mirror():
+    rates = cli.parse_rates(["sharelink=3", "a.example:8080=1"], mlwbd.ENDPOINTS)
+    assert rates["a.example:8080"] == 1 and 3 in rates.values()
+
+
+def test_batch_cli_retries_movies_with_unresolved_links(upstream, tmp_path, capsys):
+    movie_url = f"{upstream.base_url}/fojik/the-family-man-season-2/"
+    inputs = tmp_path / "inputs.txt"
+    inputs.write_text(f"{movie_url}\n")
+    output = tmp_path / "out.jsonl"
+    checkpoint = tmp_path / "done.txt"
+    argv = [str(inputs), "-o", str(output), "--checkpoint", str(checkpoint)]
+    argv += ["--default-rate", "0", "--host-concurrency", "0"]
+    upstream.inject_failure("share_api", status=403)
+    assert cli.main(argv) == 1
+    record = json.loads(output.read_text())
+    assert not record["ok"] and record["error"].endswith("links unresolved")
+    assert not checkpoint.read_text()
+    assert "0 done, 1 failed, 0 skipped" in capsys.readouterr().err
+    upstream.clear_failures()
+    assert cli.main(argv) == 0
+    assert checkpoint.read_text() == f"{movie_url}\n"
@@ -0,0 +1,86 @@
+import asyncio
+from app.endpoints import EndpointProber, EndpointRegistry
+
+
+def test_registry_keeps_configured_order_among_healthy_mirrors():
+    registry = EndpointRegistry(
+        {"fojik": ["https://a.example", "https://b.example"]}, failure_threshold=2
+    )
+    assert registry.url("fojik") == "https://a.example"
+    registry.record("https://b.example/", True, 0.05)
+    registry.record("https://a.example/page/2/", True, 0.4)
+    assert registry.url("fojik") == "https://a.example"
+    for _ in range(2):
+        registry.record("https://a.example/?s=x", False)
+    assert registry.url("fojik") == "https://b.example"
+    assert registry.failover("http://a.example/movie/?x=1") == [
+        "https://b.example/movie/?x=1",
+        "https://a.example/movie/?x=1",
+    ]
+    assert registry.owns("https://a.example/movie/", "fojik")
+    assert registry.owns("https://www.a.example/movie/", "fojik")
+    assert not registry.owns("https://a.example.evil/movie/", "fojik")
+    assert registry.failover("https://elsewhere/x") == ["https://elsewhere/x"]
+
+
+def test_legacy_alias_is_recognised_but_never_requested():
+    registry = EndpointRegistry(
+        {"fojik": ["https://a.example", "https://b.example"]},
+        {"fojik": ["https://old.example"]},
+    )
+    assert registry.owns("https://www.old.example/movie/", "fojik")
+    assert registry.mirror_for("https://old.example/movie/") is None
+    assert registry.failover("https://old.example/movie/?x=1") == [
+        "https://a.example/movie/?x=1",
+        "https://b.example/movie/?x=1",
+    ]
+    registry.record("https://old.example/movie/", False)
+    assert [m.url for m in registry.candidates("fojik")] == [
+        "https://a.example",
+        "https://b.example",
+    ]
+
+
+def test_latency_orders_mirrors_of_equal_preference():
+    registry = EndpointRegistry(
+        {"sharelink": ["https://a.example|https://b.example", "https://c.example"]}
+    )
+    registry.record("https://c.example/", True, 0.01)
+    registry.record("https://b.example/", True, 0.05)
+    registry.record("https://a.example/", True, 0.4)
+    assert [m.url for m in registry.candidates("sharelink")] == [
+        "https://b.example",
+        "https://a.example",
+        "https://c.example",
+    ]
+    assert registry.failover("https://www.a.example/s/x") == [
+        "https://b.example/s/x",
+        "https://a.example/s/x",
+        "https://c.example/s/x",
+    ]
+
+
+def test_prober_marks_down_mirrors_and_recovers():
+    registry = EndpointRegistry(
+        {"sharelink": ["https://down.example", "https://up.example"]},
+        failure_threshold=1,
+        recovery_time=60,
+    )
+    down = {"https://down.example"}
+
+    async def probe(role, url):
+        assert role == "sharelink"
+        if url in down:
+            raise ConnectionError("refused")
+        return True
+
+    prober = EndpointProber(registry, probe)
+    asyncio.run(prober.probe_all())
+    stats = registry.stats()
+    assert stats[("sharelink", "https://up.example")]["healthy"] == 1
+    assert stats[("sharelink", "https://down.example")]["errors"] == 1
+    assert registry.url("sharelink") == "https://up.example"
+    down.clear()
+    asyncio.run(prober.probe_all())
+    assert registry.stats()[("sharelink", "https://down.example")]["errors"] == 1
+    assert prober.rounds == 2
@@ -0,0 +1,44 @@
+import io
+from PIL import Image
+from starlette.testclient import TestClient
+from app import mlwbd
+from app.api import api
+from app.image_proxy import ThumbnailCache, load_secret, thumbnail_url
+
+
+def test_thumbnail_cache_evicts_least_recently_used(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=250)
+    for key in ["aa1", "bb2", "cc3"]:
+        if key == "cc3":
+            assert cache.get("aa1") == b"a" * 100
+        cache.put(key, key[0].encode() * 100)
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") and cache.get("cc3")
+    reloaded = ThumbnailCache(str(tmp_path), max_bytes=250)
+    assert reloaded.stats()["files"] == 0 and reloaded.get("cc3")
+    assert reloaded.stats()["files"] == 2
+
+
+def test_signing_secret_is_shared_through_the_cache_dir(tmp_path):
+    path = str(tmp_path / "thumbs" / ".secret")
+    secret = load_secret(path)
+    assert len(secret) == 64 and load_secret(path) == secret
+    assert [p.name for p in (tmp_path / "thumbs").iterdir()] == [".secret"]
+
+
+def test_image_route_serves_cached_webp_thumbnails(upstream):
+    poster = mlwbd.get_latest_movies(1)[0].image
+    proxied = thumbnail_url(poster)
+    path = proxied[proxied.index("/img?") :]
+    with TestClient(api) as client:
+        first = client.get(path)
+        second = client.get(path)
+        revalidated = client.get(path, headers={"If-None-Match": first.headers["etag"]})
+        forged = client.get(path.replace("&s=", "&s=0"))
+    assert first.status_code == 200 and first.headers["content-type"] == "image/webp"
+    assert "immutable" in first.headers["cache-control"]
+    assert second.content == first.content
+    assert Image.open(io.BytesIO(first.content)).size[0] == mlwbd.THUMBNAILS.width
+    assert upstream.count("poster") == 1
+    assert revalidated.status_code == 304
+    assert forged.status_code == 403
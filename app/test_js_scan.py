@@ -0,0 +1,30 @@
+import ast
+import re
+from string import Template
+from app.fixtures import load_fixture
+from app.js_scan import DLD_SSS, string_array_item
+
+ARRAYS = load_fixture("js_string_arrays.js")
+
+
+def test_scanner_matches_literal_eval_for_every_index():
+    captured = re.search(r"_0x12fb2a=(\[.*?\]);_0x3073", ARRAYS).group(1)
+    expected = ast.literal_eval(captured)
+    for index, value in enumerate(expected):
+        assert string_array_item(ARRAYS, index, "_0x12fb2a") == value
+    assert string_array_item(ARRAYS, len(expected), "_0x12fb2a") is None
+
+
+def test_scanner_finds_multiline_and_named_arrays():
+    assert string_array_item(ARRAYS, 2, "_0xabc") == "third"
+    assert string_array_item(ARRAYS, 0, "_0x9f0e") == "real"
+    assert string_array_item(ARRAYS, 0) == "apply"
+    assert string_array_item(ARRAYS, 0, "_0xmissing") is None
+
+
+def test_scanner_reads_v_from_dld_page():
+    page = Template(load_fixture("dld_php.html")).safe_substitute(
+        sss="token.sss", v="token.v"
+    )
+    assert DLD_SSS.search(page).group(1) == "token.sss"
+    assert string_array_item(page, 18, "_0x12fb2a") == "token.v"
@@ -0,0 +1,15 @@
+import sqlite3
+from app.link_cache import LinkCache
+
+
+def test_writes_purge_expired_rows(tmp_path):
+    path = str(tmp_path / "links.db")
+    cache = LinkCache(path, ttl=60, purge_interval=0)
+    cache.set("https://a.example/old/", [["a", []]], ttl=-1)
+    cache.set("https://a.example/new/", [["b", []]])
+    assert cache.get("https://a.example/new/") == [["b", []]]
+    assert cache.get("https://a.example/old/") is None
+    with sqlite3.connect(path) as conn:
+        urls = [row[0] for row in conn.execute("SELECT url FROM download_links")]
+    assert urls == ["https://a.example/new/"]
+    assert cache.stats()["purged"] == 1
@@ -0,0 +1,36 @@
+from bs4 import BeautifulSoup
+from app.fixtures import load_fixture, synthetic_download_page
+from app.link_parser import legacy_sections, segment_sections
+
+EDGE_CASES = [
+    "<h2>Movie</h2><ul><li>720p : <a href='/a'>GD</a></li></ul>"
+    "<h2>Other</h2><ul><li>1080p : <a href='/b'>GD</a></li></ul>",
+    "<p>Episode 1</p><ul><li>x : <a href='/1'>A</a></li></ul><h2>Notes</h2>"
+    "<ul><li>y : <a href='/2'>B</a></li></ul><p>Episode 2</p><ul><li><a href='/3'>C</a></li></ul>",
+    "<div><p><strong>Part 1</strong><ul><li>Nested : <a href='/n'>N</a></li></ul></p></div>"
+    "<span>Batch</span><div><ul><li><ul><li>inner : <a href='/i'>I</a></li></ul></li></ul></div>",
+    "<p><b>Ep</b> i</p><ul><li>q : <a href='/s'>S</a></li></ul><p>Ep<b>I</b>sode</p>",
+    "<p>no sections here</p>",
+]
+
+
+def assert_parity(html):
+    soup = BeautifulSoup(html, "html.parser")
+    assert segment_sections(soup) == legacy_sections(soup)
+
+
+def test_segmenter_matches_legacy_on_fixture():
+    html = load_fixture("download_page.html")
+    assert segment_sections(BeautifulSoup(html, "html.parser"))
+    assert_parity(html)
+
+
+def test_segmenter_matches_legacy_on_edge_cases():
+    for html in EDGE_CASES:
+        assert_parity(html)
+
+
+def test_segmenter_matches_legacy_on_synthetic_pages():
+    for episodes in [1, 5, 40]:
+        assert_parity(synthetic_download_page(episodes))
+        assert_parity(synthetic_download_page(episodes, inline=True))
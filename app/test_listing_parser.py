@@ -0,0 +1,21 @@
+from app.fixtures import load_fixture
+from app.listing_parser import (
+    parse_listing_full,
+    parse_listing_lxml,
+    parse_listing_soup,
+)
+
+
+def test_listing_parsers_match_full_parse():
+    for name in ["latest_page.html", "search_page.html"]:
+        html = load_fixture(name)
+        for strip_alt in [True, False]:
+            expected = parse_listing_full(html, strip_alt=strip_alt)
+            assert expected
+            assert parse_listing_soup(html, strip_alt=strip_alt) == expected
+            assert parse_listing_lxml(html, strip_alt=strip_alt) == expected
+
+
+def test_listing_parser_handles_empty_page():
+    assert parse_listing_lxml("") == []
+    assert parse_listing_soup("") == []
@@ -0,0 +1,40 @@
+from starlette.testclient import TestClient
+from app import mlwbd
+from app.api import api
+from app.metrics import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = MetricsRegistry()
+    hits = registry.counter("demo_hits_total", "Hits.", ["route"])
+    seconds = registry.histogram("demo_seconds", "Latency.", ["route"], [0.1, 1])
+    registry.gauges("demo_size", "Size.", ["cache"], lambda: [(("a",), 3)])
+    hits.inc(route='say "hi"\n')
+    seconds.observe(0.5, route="/x")
+    assert registry.render().splitlines() == [
+        "# HELP demo_hits_total Hits.",
+        "# TYPE demo_hits_total counter",
+        'demo_hits_total{route="say \\"hi\\"\\n"} 1',
+        "# HELP demo_seconds Latency.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/x",le="0.1"} 0',
+        'demo_seconds_bucket{route="/x",le="1"} 1',
+        'demo_seconds_bucket{route="/x",le="+Inf"} 1',
+        'demo_seconds_sum{route="/x"} 0.5',
+        'demo_seconds_count{route="/x"} 1',
+        "# HELP demo_size Size.",
+        "# TYPE demo_size gauge",
+        'demo_size{cache="a"} 3',
+    ]
+
+
+def test_metrics_endpoint_exposes_scrape_metrics(upstream):
+    assert mlwbd.get_latest_movies(1)
+    with TestClient(api) as client:
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE mlwbd_request_attempt_seconds histogram" in lines
+    assert any(line.startswith("mlwbd_cache_events{") for line in lines)
+    assert all(line.startswith("#") or len(line.rsplit(" ", 1)) == 2 for line in lines)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from app import mlwbd
+from app.endpoints import EndpointRegistry
+from app.metrics import HOP_ERRORS, HOP_SECONDS
+from app.session_pool import SessionPool
+
+
+def test_search_and_latest_offline(upstream):
+    results = mlwbd.search_movie("avatar")
+    assert results and all(
+        movie.link.startswith(upstream.base_url) for movie in results
+    )
+    assert mlwbd.get_latest_movies(1)
+    assert mlwbd.get_latest_movies(upstream.max_pages + 1) == []
+
+
+def test_full_link_chain_offline(upstream):
+    movie_url = f"{upstream.base_url}/fojik/the-family-man-season-2/"
+    groups = mlwbd.get_download_links(movie_url)
+    assert [group.title for group in groups][:2] == ["BatchZip", "Episode 01"]
+    urls = [link.url for group in groups for link in group.links]
+    assert urls and not any(".me" in url for url in urls)
+    direct = mlwbd.get_main_link_(urls[0])
+    assert direct == f"{upstream.base_url}/sharelink/file/batch-720-gd.mkv"
+    assert mlwbd.get_download_links(movie_url) == groups
+    assert upstream.count("links") == 1
+
+
+def test_slow_upstream_does_not_hold_up_cached_pages(upstream):
+    movie_url = f"{upstream.base_url}/fojik/the-family-man-season-2/"
+    groups = mlwbd.get_download_links(movie_url)
+    upstream.route_latency["listing"] = 0.5
+
+    async def scenario():
+        url = f"{mlwbd.ENDPOINTS.url('fojik')}/page/1/"
+        with mlwbd.SESSION_POOL.session() as scraper:
+            slow = [
+                asyncio.ensure_future(
+                    mlwbd.async_request_with_retry(scraper, "get", url)
+                )
+                for _ in range(12)
+            ]
+            await asyncio.sleep(0.05)
+            started = time.monotonic()
+            cached = await mlwbd.async_get_download_links(movie_url)
+            elapsed = time.monotonic() - started
+            await asyncio.gather(*slow)
+        return cached, elapsed
+
+    cached, elapsed = mlwbd.run_sync(scenario())
+    assert cached == groups and elapsed < 0.25
+
+
+def test_link_chain_gives_up_on_injected_failure(upstream):
+    upstream.inject_failure("blog", status=503)
+    movie_url = f"{upstream.base_url}/fojik/the-family-man-season-2/"
+    host = upstream.base_url.split("://")[1]
+    labels = {"chain": "download_links", "step": "blog_php", "host": host}
+    assert mlwbd.get_download_links(movie_url) == []
+    assert upstream.count("blog") == 2
+    assert HOP_SECONDS.count(**labels) == 1
+    assert HOP_ERRORS.value(reason="request", **labels) == 1
+
+
+def test_http_errors_keep_the_pooled_session(upstream, monkeypatch):
+    pool = SessionPool(mlwbd.get_scraper)
+    monkeypatch.setattr(mlwbd, "SESSION_POOL", pool)
+    with pool.session() as scraper:
+        url = f"{upstream.base_url}/fojik/page/{upstream.max_pages + 1}/"
+        assert mlwbd.request_with_retry(scraper, "get", url) is None
+    assert pool.stats()["idle"] == 1 and pool.stats()["recycled"] == 0
+
+
+def test_dead_primary_mirror_fails_over(upstream, monkeypatch):
+    mirrors = {role: [url] for role, url in upstream.urls().items()}
+    mirrors["fojik"].insert(0, "http://127.0.0.1:9/fojik")
+    registry = EndpointRegistry(mirrors, failure_threshold=1)
+    monkeypatch.setattr(mlwbd, "ENDPOINTS", registry)
+    assert mlwbd.search_movie("avatar")
+    assert registry.url("fojik") == f"{upstream.base_url}/fojik"
+    assert mlwbd.is_movie_url("http://127.0.0.1:9/fojik/some-movie/")
+    assert mlwbd.get_latest_movies(1)
+    assert upstream.count("search") == 1
+
+
+def test_legacy_domain_links_are_fetched_from_the_current_mirror(upstream, monkeypatch):
+    mirrors = {role: [url] for role, url in upstream.urls().items()}
+    registry = EndpointRegistry(mirrors, {"fojik": ["http://127.0.0.1:9/fojik"]})
+    monkeypatch.setattr(mlwbd, "ENDPOINTS", registry)
+    legacy_url = "http://127.0.0.1:9/fojik/the-family-man-season-2/"
+    assert mlwbd.is_movie_url(legacy_url)
+    groups = mlwbd.get_download_links(legacy_url)
+    assert [group.title for group in groups][:2] == ["BatchZip", "Episode 01"]
+    assert upstream.count("movie") == 1
+    assert all(mirror.site != "127.0.0.1:9/fojik" for mirror in registry.mirrors())
+
+
+def test_probe_rejects_a_parked_listing_mirror(upstream):
+    assert mlwbd.run_sync(mlwbd._probe_endpoint("fojik", f"{upstream.base_url}/fojik"))
+    parked = f"{upstream.base_url}/parked"
+    assert not mlwbd.run_sync(mlwbd._probe_endpoint("fojik", parked))
+    assert mlwbd.is_movie_url(f"http://www.{upstream.base_url[7:]}/fojik/x/")
+
+
+def test_not_found_neither_credits_nor_fails_a_mirror(upstream):
+    with mlwbd.SESSION_POOL.session() as scraper:
+        url = f"{upstream.base_url}/fojik/page/{upstream.max_pages + 1}/"
+        assert mlwbd.request_with_retry(scraper, "get", url) is None
+    stats = mlwbd.ENDPOINTS.stats()[("fojik", f"{upstream.base_url}/fojik")]
+    assert stats["requests"] == 0 and stats["healthy"] == 1
+
+
+def test_listing_revalidates_instead_of_reparsing(upstream, monkeypatch):
+    monkeypatch.setattr(mlwbd.PREFETCHER, "depth", 0)
+    first = mlwbd.get_latest_movies(1)
+    mlwbd.LATEST_CACHE.clear()
+    assert mlwbd.get_latest_movies(1) == first
+    assert mlwbd.CONDITIONAL.stats()["not_modified"] == 1
+    upstream.etags = False
+    mlwbd.LATEST_CACHE.clear()
+    assert mlwbd.get_latest_movies(1) == first
+    stats = mlwbd.CONDITIONAL.stats()
+    assert stats["unchanged"] == 1 and stats["parsed"] == 1
+    assert upstream.count("listing") == 3
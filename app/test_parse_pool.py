@@ -0,0 +1,27 @@
+import asyncio
+from app.fixtures import load_fixture
+from app.parse_pool import ParsePool, hidden_inputs, link_rows, listing_rows
+
+
+def test_process_pool_matches_inline_parsers():
+    listing = load_fixture("latest_page.html").encode()
+    download = load_fixture("download_page.html").encode()
+    form = b'<input type="hidden" name="FU" value="a"><input name="FN" type="hidden" value="b">'
+    pool = ParsePool(workers=1)
+
+    async def parse_all():
+        return await asyncio.gather(
+            pool.run(listing_rows, listing, "utf-8"),
+            pool.run(link_rows, download, "utf-8"),
+            pool.run(hidden_inputs, form, None, ("FU", "FN", "FU2")),
+        )
+
+    try:
+        pool.start()
+        movies, groups, inputs = asyncio.run(parse_all())
+    finally:
+        pool.shutdown()
+    assert movies == listing_rows(listing) and movies
+    assert groups == link_rows(download) and groups
+    assert inputs == {"FU": "a", "FN": "b"}
+    assert pool.stats()["offloaded"] == 3
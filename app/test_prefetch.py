@@ -0,0 +1,62 @@
+import asyncio
+from app.prefetch import PagePrefetcher
+from app.result_cache import TTLCache
+
+
+def _prefetcher(fetched, delay=0.01, **kwargs):
+    async def fetch(page):
+        fetched.append(page)
+        await asyncio.sleep(delay)
+        return [f"movie-{page}"]
+
+    return PagePrefetcher(fetch, TTLCache(), **kwargs)
+
+
+def test_serving_a_page_prefetches_the_next_one():
+    fetched = []
+    prefetcher = _prefetcher(fetched)
+
+    async def scenario():
+        prefetcher.schedule(1)
+        await asyncio.gather(*prefetcher._inflight.values())
+
+    asyncio.run(scenario())
+    assert fetched == [2] and prefetcher._cache.get(2) == ["movie-2"]
+    assert prefetcher.stats() == {
+        "inflight": 0,
+        "scheduled": 1,
+        "completed": 1,
+        "failed": 0,
+    }
+
+
+def test_wait_joins_a_running_prefetch_instead_of_refetching():
+    fetched = []
+    prefetcher = _prefetcher(fetched, delay=0.05)
+
+    async def scenario():
+        prefetcher.schedule(1)
+        await asyncio.sleep(0)
+        await prefetcher.wait(2)
+        assert prefetcher._cache.is_fresh(2)
+        prefetcher.schedule(1)
+        return prefetcher.stats()["scheduled"]
+
+    assert asyncio.run(scenario()) == 1
+    assert fetched == [2]
+
+
+def test_depth_max_page_and_max_inflight_limit_prefetches():
+    fetched = []
+    prefetcher = _prefetcher(fetched, depth=3, max_page=4, max_inflight=2)
+
+    async def scenario():
+        prefetcher.schedule(1)
+        assert sorted(prefetcher._inflight) == [2, 3]
+        await asyncio.gather(*prefetcher._inflight.values())
+        prefetcher.schedule(2)
+        assert sorted(prefetcher._inflight) == [4]
+        await asyncio.gather(*prefetcher._inflight.values())
+
+    asyncio.run(scenario())
+    assert sorted(fetched) == [2, 3, 4]
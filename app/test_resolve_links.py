@@ -0,0 +1,61 @@
+from app import mlwbd
+from app.states.details_state import DetailsState
+
+
+def _link(url):
+    return {"label": "720p", "url": url, "info": "", "direct": "", "status": ""}
+
+
+def test_iter_main_links_dedupes_and_bounds_concurrency(upstream, monkeypatch):
+    movie_url = f"{upstream.base_url}/fojik/the-family-man-season-2/"
+    urls = [
+        link.url
+        for group in mlwbd.get_download_links(movie_url)
+        for link in group.links
+    ]
+    resolve = mlwbd.async_get_main_link
+    calls = []
+    inflight = [0, 0]
+
+    async def counting(url):
+        calls.append(url)
+        inflight[0] += 1
+        inflight[1] = max(inflight)
+        try:
+            return await resolve(url)
+        finally:
+            inflight[0] -= 1
+
+    monkeypatch.setattr(mlwbd, "async_get_main_link", counting)
+
+    async def scenario():
+        return [item async for item in mlwbd.async_iter_main_links(urls + urls, 2)]
+
+    results = dict(mlwbd.run_sync(scenario()))
+    assert sorted(calls) == sorted(set(urls)) and len(results) == len(set(urls))
+    assert inflight[1] == 2
+    assert all(result.endswith(".mkv") for result in results.values())
+
+
+def test_resolve_all_links_sets_status_per_link(upstream):
+    movie_url = f"{upstream.base_url}/fojik/the-family-man-season-2/"
+    good = mlwbd.get_download_links(movie_url)[0].links[0].url
+    bad = f"{upstream.base_url}/sharelink/missing/"
+    state = DetailsState(_reflex_internal_init=True)
+    state.download_groups = [
+        {"title": "Batch", "links": [_link(good), _link(bad)]},
+        {"title": "Episode 01", "links": [_link(good)]},
+    ]
+
+    async def scenario():
+        async for _ in DetailsState.resolve_all_links.fn(state):
+            pass
+
+    mlwbd.run_sync(scenario())
+    links = [link for group in state.download_groups for link in group["links"]]
+    assert [link["status"] for link in links] == ["done", "error", "done"]
+    assert links[0]["direct"] == links[2]["direct"]
+    assert links[0]["direct"].endswith(".mkv") and links[1]["direct"] == ""
+    assert state.resolved_count == state.resolve_total == 2
+    assert not state.is_resolving_all
+    assert upstream.count("share") == 1
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from app.result_cache import TTLCache
+
+
+def test_entries_expire_after_ttl_and_stale_window():
+    cache = TTLCache(ttl=0.05, stale_ttl=0.1)
+    cache.set("a", [1])
+    assert cache.get("a") == [1] and cache.is_fresh("a")
+    time.sleep(0.06)
+    assert cache.get("a") == [1] and not cache.is_fresh("a")
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    cache.set("empty", [])
+    assert cache.get("empty") is None
+    assert cache.stats() == {
+        "size": 0,
+        "hits": 1,
+        "stale_hits": 1,
+        "misses": 2,
+        "evictions": 0,
+    }
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", [1])
+    cache.set("b", [2])
+    assert cache.get("a") == [1]
+    cache.set("c", [3])
+    assert cache.get("b") is None
+    assert cache.get("a") == [1] and cache.get("c") == [3]
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+
+
+def test_stale_hit_returns_old_value_and_refreshes_once():
+    cache = TTLCache(ttl=0.01, stale_ttl=10)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return [len(loads) + 1]
+
+    async def scenario():
+        cache.set("k", [1])
+        await asyncio.sleep(0.015)
+        stale = await asyncio.gather(
+            *[cache.get_or_load("k", loader) for _ in range(3)]
+        )
+        assert stale == [[1], [1], [1]]
+        await asyncio.gather(*cache._tasks)
+        return await cache.get_or_load("k", loader)
+
+    assert asyncio.run(scenario()) == [2]
+    assert loads == [1]
+    assert cache.stats()["stale_hits"] == 3 and cache.stats()["hits"] == 1
+
+
+def test_miss_loads_and_caches():
+    cache = TTLCache()
+
+    async def loader():
+        return ["fresh"]
+
+    assert asyncio.run(cache.get_or_load("k", loader)) == ["fresh"]
+    assert cache.get("k") == ["fresh"]
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
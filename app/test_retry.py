@@ -0,0 +1,90 @@
+import asyncio
+import random
+import time
+from requests import Response
+from requests.exceptions import ConnectionError, HTTPError, ReadTimeout
+from cloudscraper.exceptions import CloudflareChallengeError
+from app import mlwbd
+from app.retry import CircuitBreaker, CircuitBreakers, RetryPolicy, is_host_failure
+
+
+def _http_error(status):
+    response = Response()
+    response.status_code = status
+    return HTTPError(f"{status} error", response=response)
+
+
+def test_policy_classifies_errors():
+    policy = RetryPolicy()
+    assert policy.is_retryable(ReadTimeout())
+    assert policy.is_retryable(_http_error(503))
+    assert policy.is_retryable(CloudflareChallengeError("challenge"))
+    assert not policy.is_retryable(_http_error(404))
+    assert is_host_failure(ConnectionError())
+    assert not is_host_failure(_http_error(403))
+    assert not is_host_failure(CloudflareChallengeError("challenge"))
+
+
+def test_policy_backoff_stays_within_bounds():
+    random.seed(3)
+    policy = RetryPolicy(base_delay=0.5, max_delay=4)
+    delay = policy.base_delay
+    for _ in range(20):
+        delay = policy.next_delay(delay)
+        assert 0.5 <= delay <= 4
+
+
+def test_breaker_opens_probes_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(0.05)
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(0.05)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+    assert breaker.rejected == 3
+
+
+def test_abandoned_or_lost_probe_does_not_stick_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0.05)
+    breaker.record_failure()
+    time.sleep(0.05)
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
+    # Neither outcome nor abandon: the probe expires after recovery_time.
+    assert not breaker.allow()
+    time.sleep(0.05)
+    assert breaker.allow() and breaker.state == "half_open"
+
+
+def test_cancelled_probe_request_frees_the_breaker(upstream, monkeypatch):
+    breakers = CircuitBreakers(failure_threshold=1, recovery_time=1)
+    monkeypatch.setattr(mlwbd, "CIRCUIT_BREAKERS", breakers)
+    upstream.route_latency["listing"] = 0.5
+    url = f"{mlwbd.ENDPOINTS.url('fojik')}/page/1/"
+    breaker = breakers.get(mlwbd._host(url))
+    breaker.record_failure()
+    breaker.opened_at -= 1
+
+    async def scenario():
+        with mlwbd.SESSION_POOL.session() as scraper:
+            probe = asyncio.ensure_future(
+                mlwbd.async_request_with_retry(scraper, "get", url)
+            )
+            await asyncio.sleep(0.05)
+            assert breaker.state == "half_open" and not breaker.allow()
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+            upstream.route_latency.clear()
+            return await mlwbd.async_request_with_retry(scraper, "get", url)
+
+    assert mlwbd.run_sync(scenario()).status_code == 200
+    assert breaker.state == "closed"
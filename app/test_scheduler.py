@@ -0,0 +1,84 @@
+import asyncio
+import time
+from app.scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    PRIORITY,
+    RequestScheduler,
+    request_priority,
+)
+
+
+def test_token_bucket_spaces_requests_after_the_burst():
+    scheduler = RequestScheduler({"a.example": 50}, burst=2)
+
+    async def burst():
+        for _ in range(5):
+            async with scheduler.slot("a.example"):
+                pass
+            async with scheduler.slot("b.example"):
+                pass
+
+    started = time.monotonic()
+    asyncio.run(burst())
+    assert time.monotonic() - started >= 0.05
+    stats = scheduler.stats()
+    assert stats["a.example"]["granted"] == 5 and stats["a.example"]["waited"] == 3
+    assert stats["b.example"]["waited"] == 0
+
+
+def test_concurrency_cap_limits_requests_in_flight():
+    scheduler = RequestScheduler(concurrency=2)
+    inflight = []
+
+    async def request():
+        async with scheduler.slot("a.example"):
+            inflight.append(scheduler.stats()["a.example"]["inflight"])
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(*[request() for _ in range(6)])
+
+    asyncio.run(scenario())
+    assert max(inflight) == 2 and len(inflight) == 6
+    assert scheduler.stats()["a.example"]["inflight"] == 0
+
+
+def test_interactive_requests_jump_queued_background_ones():
+    scheduler = RequestScheduler(concurrency=1)
+    order = []
+
+    async def request(name):
+        async with scheduler.slot("a.example"):
+            order.append(name)
+            await asyncio.sleep(0.005)
+
+    async def scenario():
+        with request_priority(BACKGROUND):
+            background = [asyncio.ensure_future(request(f"bg{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        assert PRIORITY.get() == INTERACTIVE
+        await request("click")
+        await asyncio.gather(*background)
+
+    asyncio.run(scenario())
+    assert order == ["bg0", "click", "bg1", "bg2"]
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    scheduler = RequestScheduler(concurrency=1)
+
+    async def scenario():
+        state, _ = await scheduler.acquire("a.example")
+        queued = asyncio.ensure_future(scheduler.acquire("a.example"))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["a.example"]["queued"] == 1
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        scheduler.release(state)
+        async with scheduler.slot("a.example") as waited:
+            assert waited < 0.01
+
+    asyncio.run(asyncio.wait_for(scenario(), 1))
+    stats = scheduler.stats()["a.example"]
+    assert stats["queued"] == 0 and stats["inflight"] == 0
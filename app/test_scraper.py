@@ -10,26 +10,21 @@ def test_scraper():
         print("No movies found. Skipping link extraction.")
         return
     first_movie = movies[0]
-    print(f"First movie: {first_movie.get('title')} - {first_movie.get('link')}")
-    if not first_movie.get("link"):
+    print(f"First movie: {first_movie.title} - {first_movie.link}")
+    if not first_movie.link:
         print("No link in first movie result.")
         return
     print("""
 2. Testing get_download_links()...""")
-    links = get_download_links(first_movie["link"])
+    links = get_download_links(first_movie.link)
     print(f"Found {len(links)} link groups/items.")
     if not links:
         print("No download links found.")
         return
     target_url = None
-    if isinstance(links[0], dict):
-        if "links" in links[0]:
-            if links[0]["links"]:
-                target_url = links[0]["links"][0].get("url")
-                print(f"Selected target URL from Strategy 1: {target_url}")
-        elif "link" in links[0]:
-            target_url = links[0].get("link")
-            print(f"Selected target URL from Strategy 2: {target_url}")
+    if links[0].links:
+        target_url = links[0].links[0].url
+        print(f"Selected target URL from {links[0].title}: {target_url}")
     if target_url:
         print("""
 3. Testing get_main_link_()...""")
@@ -0,0 +1,43 @@
+from app import mlwbd, scraper_config
+from app.states.search_state import SearchState
+
+
+def _run(state, handler):
+    async def drive():
+        async for _ in handler.fn(state):
+            pass
+
+    mlwbd.run_sync(drive())
+
+
+def test_feed_window_slides_both_ways_and_reuses_cached_pages(upstream, monkeypatch):
+    monkeypatch.setattr(scraper_config, "FEED_WINDOW_PAGES", 2)
+    monkeypatch.setattr(mlwbd.PREFETCHER, "depth", 0)
+    upstream.max_pages = 5
+    state = SearchState(_reflex_internal_init=True)
+    _run(state, SearchState.load_latest_movies)
+    size = len(state.latest_movies)
+    assert size and state.page_sizes == [size]
+
+    for _ in range(3):
+        _run(state, SearchState.load_more_movies)
+    assert (state.first_page, state.page) == (3, 4)
+    assert state.page_sizes == [size, size] and len(state.latest_movies) == 2 * size
+    assert state.has_previous_movies
+    assert upstream.count("listing") == 4
+
+    _run(state, SearchState.load_previous_movies)
+    assert (state.first_page, state.page) == (2, 3)
+    _run(state, SearchState.load_previous_movies)
+    assert (state.first_page, state.page) == (1, 2)
+    assert not state.has_previous_movies
+    _run(state, SearchState.load_previous_movies)
+    assert (state.first_page, state.page) == (1, 2)
+    assert len(state.latest_movies) == 2 * size
+    assert upstream.count("listing") == 4
+
+    for _ in range(4):
+        _run(state, SearchState.load_more_movies)
+    assert (state.first_page, state.page) == (4, 5)
+    assert not state.has_more_movies
+    assert upstream.count("listing") == 6
@@ -0,0 +1,60 @@
+import pytest
+from cloudscraper.exceptions import CloudflareChallengeError
+from requests.exceptions import ConnectionError, HTTPError
+from app.retry import is_session_failure
+from app.session_pool import SessionPool
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_returned_sessions_and_recycles_by_use():
+    pool = SessionPool(FakeSession, max_size=2, max_uses=2)
+    with pool.session() as first:
+        pass
+    with pool.session() as again:
+        assert again is first
+    assert first.closed
+    with pool.session() as fresh:
+        assert fresh is not first
+    assert pool.stats() == {
+        "idle": 1,
+        "leased": 0,
+        "created": 2,
+        "reused": 1,
+        "recycled": 1,
+    }
+
+
+def test_pool_recycles_sessions_past_max_age():
+    pool = SessionPool(FakeSession, max_age=0)
+    with pool.session() as first:
+        pass
+    with pool.session() as second:
+        assert second is not first
+    assert first.closed and pool.stats()["created"] == 2
+
+
+def test_pool_drops_failed_sessions():
+    pool = SessionPool(FakeSession)
+    with pytest.raises(RuntimeError):
+        with pool.session() as broken:
+            raise RuntimeError("boom")
+    assert broken.closed
+    with pool.session() as marked:
+        pool.mark_failed(marked)
+    assert marked.closed
+    with pool.session() as fresh:
+        assert fresh not in (broken, marked)
+    assert pool.stats()["recycled"] == 2
+
+
+def test_only_transport_and_challenge_errors_fail_the_session():
+    assert is_session_failure(ConnectionError())
+    assert is_session_failure(CloudflareChallengeError("challenge"))
+    assert not is_session_failure(HTTPError("403 Client Error"))
@@ -0,0 +1,42 @@
+import asyncio
+from app.singleflight import SingleFlight
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "page"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == "page"
+        assert leader.cancelled()
+
+    asyncio.run(scenario())
+    assert calls == [1]
+    assert flight.stats() == {"inflight": 0, "executions": 1, "coalesced": 1}
+
+
+def test_errors_are_shared_with_followers():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream")
+
+    async def scenario():
+        return await asyncio.gather(
+            flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert flight.stats()["executions"] == 1
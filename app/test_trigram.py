@@ -0,0 +1,39 @@
+from app import mlwbd
+from app.fixtures import synthetic_titles
+from app.models import MovieSummary
+from app.trigram import TrigramIndex, normalize_title
+
+
+def test_fuzzy_matches_rank_the_intended_title_first():
+    index = TrigramIndex()
+    index.add(synthetic_titles(2000))
+    index.add(
+        [
+            MovieSummary("Avatar.The.Way.Of.Water.2022.1080p", "", "/avatar"),
+            MovieSummary("The.Family.Man.Season.2.Hindi.720p", "", "/family"),
+        ]
+    )
+    assert normalize_title("Avatar.The.Way.Of.Water.2022.1080p") == (
+        "avatar the way of water 2022 1080p"
+    )
+    assert index.search("avatr way of watr")[0].link == "/avatar"
+    assert index.search("famly man sesn 2")[0].link == "/family"
+    assert index.search("") == []
+
+
+def test_retitled_and_evicted_movies_leave_the_index():
+    index = TrigramIndex(max_entries=2)
+    index.add([MovieSummary("Old Name", "", "/a"), MovieSummary("Batman", "", "/b")])
+    index.add([MovieSummary("Spiderman", "", "/a")])
+    assert index.search("old name") == []
+    assert index.search("spidermn")[0].link == "/a"
+    index.add([MovieSummary("Superman", "", "/c")])
+    assert len(index) == 2 and index.search("batman") == []
+
+
+def test_search_falls_back_to_fuzzy_titles_when_upstream_is_empty(upstream):
+    title = mlwbd.get_latest_movies(1)[0].title
+    upstream.inject_failure("search", status=404)
+    typo = title[:4] + title[5:]
+    results = mlwbd.search_movie(typo)
+    assert results and results[0].title == title
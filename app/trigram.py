@@ -0,0 +1,113 @@
+import itertools
+import math
+import re
+import threading
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_title(title):
+    # "Avatar.The.Way.Of.Water.2022.1080p" -> "avatar the way of water 2022 1080p"
+    return _NON_ALNUM.sub(" ", title.lower()).strip()
+
+
+def trigrams(text):
+    grams = set()
+    for word in normalize_title(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    def __init__(self, max_entries=50000, threshold=0.5, max_candidates=1000):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self._postings = {}
+        self._docs = {}
+        self._ids = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, movies):
+        with self._lock:
+            for movie in movies:
+                self._add(movie)
+
+    def _add(self, movie):
+        link = movie.link
+        title = movie.title
+        if not link or not title:
+            return
+        doc_id = self._ids.get(link)
+        if doc_id is not None:
+            if self._docs[doc_id][0].title == title:
+                return
+            self._remove(doc_id)
+        grams = frozenset(trigrams(title))
+        if not grams:
+            return
+        doc_id = self._next_id
+        self._next_id += 1
+        self._ids[link] = doc_id
+        self._docs[doc_id] = (movie, grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+        while len(self._docs) > self.max_entries:
+            self._remove(next(iter(self._docs)))
+            self.evicted += 1
+
+    def _remove(self, doc_id):
+        movie, grams = self._docs.pop(doc_id)
+        self._ids.pop(movie.link, None)
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, query, limit=20):
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        with self._lock:
+            self.searches += 1
+            # A title covering at least `needed` query trigrams must contain one
+            # of the len - needed + 1 rarest, so only those postings seed the
+            # candidate set and common grams like " th" are never scanned.
+            # Queries made only of common grams ("hindi 1080p") stop seeding
+            # once max_candidates is reached, trading recall for bounded cost.
+            needed = max(1, math.ceil(self.threshold * len(query_grams)))
+            ranked = sorted(query_grams, key=lambda g: len(self._postings.get(g, ())))
+            candidates = set()
+            for gram in ranked[: len(query_grams) - needed + 1]:
+                room = self.max_candidates - len(candidates)
+                if room <= 0:
+                    break
+                candidates.update(itertools.islice(self._postings.get(gram, ()), room))
+            scored = []
+            for doc_id in candidates:
+                movie, grams = self._docs[doc_id]
+                shared = len(query_grams & grams)
+                if shared < needed:
+                    continue
+                coverage = shared / len(query_grams)
+                similarity = shared / (len(query_grams) + len(grams) - shared)
+                scored.append((coverage, similarity, doc_id, movie))
+        scored.sort(key=lambda item: item[:3], reverse=True)
+        return [movie for *_, movie in scored[:limit]]
+
+    def stats(self):
+        return {
+            "titles": len(self._docs),
+            "trigrams": len(self._postings),
+            "searches": self.searches,
+            "evicted": self.evicted,
+        }